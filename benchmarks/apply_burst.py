@@ -0,0 +1,124 @@
+"""Load test: concurrent application submissions against one SQLite drive.
+
+Simulates a deadline rush by submitting one application per student from many
+threads at once, first with per-request commits and then with
+APPLICATION_WRITE_COALESCING (group commit via ApplicationWriter).
+
+    python benchmarks/apply_burst.py [--students 2000] [--threads 64]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from placement_portal import create_app  # noqa: E402
+from placement_portal.applications import submit_application  # noqa: E402
+from placement_portal.config import Config  # noqa: E402
+from placement_portal.extensions import db  # noqa: E402
+from placement_portal.models import Company, Drive, Student, User  # noqa: E402
+
+
+def build_app(coalesce: bool, students: int):
+    tmp = tempfile.mkdtemp(prefix="apply-burst-")
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp}/bench.sqlite3"
+        SQLALCHEMY_ENGINE_OPTIONS = {"pool_size": 64, "max_overflow": 64, "connect_args": {"timeout": 5}}
+        APPLICATION_WRITE_COALESCING = coalesce
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        db.session.execute(
+            insert(User),
+            [{"id": 1, "email": "co@bench", "role": "company", "password_hash": "-"}]
+            + [
+                {"id": i, "email": f"s{i}@bench", "role": "student", "password_hash": "-"}
+                for i in range(2, students + 2)
+            ],
+        )
+        db.session.execute(insert(Company), [{"user_id": 1, "company_name": "Bench", "approval_status": "approved"}])
+        db.session.execute(
+            insert(Student),
+            [{"user_id": i, "student_uid": f"S{i}", "full_name": f"Student {i}"} for i in range(2, students + 2)],
+        )
+        db.session.add(Drive(id=1, company_id=1, job_title="Bench", job_description="-", status="approved"))
+        db.session.commit()
+    return app
+
+
+def run(coalesce: bool, students: int, threads: int) -> dict:
+    app = build_app(coalesce, students)
+    ids = list(range(2, students + 2))
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(threads)
+
+    def worker(chunk):
+        nonlocal errors
+        start_barrier.wait()
+        for student_id in chunk:
+            t0 = time.perf_counter()
+            with app.app_context():
+                try:
+                    submit_application(student_id, 1)
+                    db.session.commit()
+                    ok = True
+                except OperationalError:
+                    db.session.rollback()
+                    ok = False
+            elapsed = time.perf_counter() - t0
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors += 1
+
+    chunks = [ids[i::threads] for i in range(threads)]
+    pool = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    t0 = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0  # noqa: E731
+    return {
+        "mode": "group-commit" if coalesce else "per-request",
+        "ok": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / wall,
+        "p50_ms": pct(0.50),
+        "p99_ms": pct(0.99),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=64)
+    args = parser.parse_args()
+
+    for coalesce in (False, True):
+        r = run(coalesce, args.students, args.threads)
+        print(
+            f"{r['mode']:>12}: {r['ok']} ok, {r['errors']} locked, "
+            f"{r['throughput']:.0f} applications/s, p50 {r['p50_ms']:.1f} ms, p99 {r['p99_ms']:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark: encoding a 10k-application API payload.
+
+Compares the previous path (datetimes converted to strings per field, then
+Flask's default JSON provider) with the API encoders in api/encoding.py:
+stdlib JSON, orjson and MessagePack (the last two only when installed).
+
+    python benchmarks/encode_applications.py [--rows 10000] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from placement_portal import create_app  # noqa: E402
+from placement_portal.api import encoding  # noqa: E402
+from placement_portal.api.serializers import application_to_dict  # noqa: E402
+from placement_portal.config import Config  # noqa: E402
+from placement_portal.models import Application  # noqa: E402
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+
+
+def build_payload(rows: int) -> dict:
+    start = datetime(2026, 1, 1, 9, 30)
+    apps = [
+        Application(
+            id=i,
+            student_id=1000 + i,
+            student_name=f"Student {i}",
+            student_uid=f"21F{i:06d}",
+            drive_id=i % 50,
+            job_title="Backend Engineer",
+            company_id=i % 20,
+            company_name="Acme Corp",
+            status="applied",
+            application_date=start + timedelta(minutes=i),
+            updated_at=start + timedelta(minutes=i, seconds=30),
+        )
+        for i in range(rows)
+    ]
+    return {"success": True, "data": {"applications": [application_to_dict(a) for a in apps]}}
+
+
+def stringify_dates(payload: dict) -> dict:
+    """What the serializers produced before: ISO strings built per field in Python."""
+    items = [
+        {k: v.isoformat() if isinstance(v, datetime) else v for k, v in item.items()}
+        for item in payload["data"]["applications"]
+    ]
+    return {"success": True, "data": {"applications": items}}
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        payload = build_payload(args.rows)
+        orjson, msgpack = encoding.orjson, encoding.msgpack
+
+        cases = {"flask jsonify (per-field isoformat)": lambda: app.json.dumps(stringify_dates(payload))}
+        encoding.orjson = None
+        cases["stdlib json (encoder default)"] = lambda: encoding.dumps_json(payload)
+        results = {name: best_of(args.repeat, fn) for name, fn in cases.items()}
+        encoding.orjson = orjson
+
+        if orjson is not None:
+            results["orjson"] = best_of(args.repeat, lambda: encoding.dumps_json(payload))
+        if msgpack is not None:
+            results["msgpack"] = best_of(args.repeat, lambda: encoding.dumps_msgpack(payload))
+
+    print(f"{args.rows} applications, best of {args.repeat}:")
+    for name, ms in results.items():
+        print(f"  {name:>36}: {ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark: ORM vs Core read path for the list endpoints.
+
+Loads and serializes every drive and application the way /api/drives and
+/api/applications did before (ORM objects + *_to_dict) and the way they do
+now (readmodels.py selects + *_row_to_dict), and reports rows/sec.
+
+    python benchmarks/list_rows.py [--applications 50000] [--drives 2000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from placement_portal import create_app  # noqa: E402
+from placement_portal.api.serializers import (  # noqa: E402
+    application_row_to_dict,
+    application_to_dict,
+    drive_row_to_dict,
+    drive_to_dict,
+)
+from placement_portal.config import Config  # noqa: E402
+from placement_portal.extensions import db  # noqa: E402
+from placement_portal.models import Application, Company, Drive, User  # noqa: E402
+from placement_portal.readmodels import application_rows, drive_rows  # noqa: E402
+
+
+def build_app(applications: int, drives: int):
+    tmp = tempfile.mkdtemp(prefix="list-rows-")
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp}/bench.sqlite3"
+
+    app = create_app(BenchConfig)
+    start = datetime(2026, 1, 1, 9, 30)
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(User), [{"id": 1, "email": "co@bench", "role": "company", "password_hash": "-"}])
+        db.session.execute(insert(Company), [{"user_id": 1, "company_name": "Bench", "approval_status": "approved"}])
+        db.session.execute(
+            insert(Drive),
+            [
+                {
+                    "id": i,
+                    "company_id": 1,
+                    "job_title": f"Role {i}",
+                    "job_description": "Lorem ipsum " * 20,
+                    "required_skills": "python, sql",
+                    "status": "approved",
+                    "is_visible": True,
+                    "created_at": start + timedelta(minutes=i),
+                    "updated_at": start + timedelta(minutes=i),
+                }
+                for i in range(1, drives + 1)
+            ],
+        )
+        db.session.execute(
+            insert(Application),
+            [
+                {
+                    "id": i,
+                    "student_id": 1_000_000 + i,
+                    "drive_id": i % drives + 1,
+                    "status": "applied",
+                    "student_name": f"Student {i}",
+                    "student_uid": f"S{i}",
+                    "job_title": f"Role {i % drives + 1}",
+                    "company_id": 1,
+                    "company_name": "Bench",
+                    "application_date": start + timedelta(seconds=i),
+                    "updated_at": start + timedelta(seconds=i),
+                }
+                for i in range(1, applications + 1)
+            ],
+        )
+        db.session.commit()
+    return app
+
+
+def rows_per_second(app, repeat: int, load) -> float:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        with app.app_context():
+            t0 = time.perf_counter()
+            count = len(load())
+            best = min(best, time.perf_counter() - t0)
+    return count / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--applications", type=int, default=50_000)
+    parser.add_argument("--drives", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = build_app(args.applications, args.drives)
+    cases = {
+        "applications / ORM": lambda: [
+            application_to_dict(a)
+            for a in Application.query.options(selectinload(Application.placement)).order_by(
+                Application.application_date.desc()
+            )
+        ],
+        "applications / Core": lambda: [
+            application_row_to_dict(r)
+            for r in db.session.execute(application_rows().order_by(Application.application_date.desc()))
+        ],
+        "drives / ORM": lambda: [
+            drive_to_dict(d)
+            for d in Drive.query.options(selectinload(Drive.company)).order_by(Drive.created_at.desc())
+        ],
+        "drives / Core": lambda: [
+            drive_row_to_dict(r) for r in db.session.execute(drive_rows().order_by(Drive.created_at.desc()))
+        ],
+    }
+    for name, load in cases.items():
+        print(f"{name:>20}: {rows_per_second(app, args.repeat, load):10,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
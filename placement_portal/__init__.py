@@ -2,9 +2,22 @@ from pathlib import Path
 
 from flask import Flask
 
-from .cli import init_db_command
+from .cli import (
+    bench_password_hash_command,
+    close_expired_drives_command,
+    compact_notifications_command,
+    init_db_command,
+    rebuild_student_trigrams_command,
+    recompute_drive_visibility_command,
+    recount_drive_applicants_command,
+    recount_unread_notifications_command,
+    resync_application_names_command,
+)
+from .authz import init_authz
 from .config import Config
 from .extensions import csrf, db, login_manager
+from .profiling import init_profiler
+from .scheduler import init_scheduler
 
 
 def create_app(config_object: type[Config] = Config) -> Flask:
@@ -22,6 +35,7 @@ def create_app(config_object: type[Config] = Config) -> Flask:
     login_manager.login_message_category = "info"
     # Extra protection against session hijacking (OK for this course project).
     login_manager.session_protection = "strong"
+    init_authz(app)
 
     from .main.routes import bp as main_bp
 
@@ -45,5 +59,16 @@ def create_app(config_object: type[Config] = Config) -> Flask:
 
     # CLI
     app.cli.add_command(init_db_command)
+    app.cli.add_command(compact_notifications_command)
+    app.cli.add_command(close_expired_drives_command)
+    app.cli.add_command(resync_application_names_command)
+    app.cli.add_command(rebuild_student_trigrams_command)
+    app.cli.add_command(recount_drive_applicants_command)
+    app.cli.add_command(recompute_drive_visibility_command)
+    app.cli.add_command(recount_unread_notifications_command)
+    app.cli.add_command(bench_password_hash_command)
+
+    init_scheduler(app)
+    init_profiler(app)
 
     return app
@@ -2,13 +2,30 @@ from __future__ import annotations
 
 from urllib.parse import urlparse
 
-from flask import Blueprint, abort, flash, redirect, render_template, request, url_for
+from flask import (
+    Blueprint,
+    abort,
+    current_app,
+    flash,
+    redirect,
+    render_template,
+    request,
+    send_from_directory,
+    url_for,
+)
 from flask_login import current_user, login_required
-from sqlalchemy import or_
+from sqlalchemy import or_, select
+from sqlalchemy.orm import contains_eager
 
 from ..decorators import roles_required
 from ..extensions import db
 from ..models import Application, Company, Drive, Placement, Student, User
+from ..moderation import ACTIONS, moderate
+from ..profiling import list_profiles, make_profile_token, profiles_dir
+from ..readmodels import application_rows
+from ..search_cache import cached_search, normalize_query
+from ..transactions import write_transaction
+from ..trigrams import student_search_query
 
 bp = Blueprint("admin", __name__)
 
@@ -25,6 +42,25 @@ def _redirect_next(default_url: str):
         return redirect(default_url)
     return redirect(next_url)
 
+
+def _bulk_moderate(target: str, singular: str):
+    action = request.form.get("action")
+    ids = [int(v) for v in request.form.getlist("ids") if v.isdigit()]
+    if action not in ACTIONS or not ids:
+        flash("Select at least one row and an action.", "warning")
+        return _redirect_next(url_for(f"admin.{target}"))
+
+    results = list(moderate(target, action, ids).values())
+    updated = results.count("updated")
+    message = f"{ACTIONS[action].capitalize()} {updated} {singular if updated == 1 else target}"
+    if results.count("unchanged"):
+        message += f", {results.count('unchanged')} unchanged"
+    if results.count("not_found"):
+        message += f", {results.count('not_found')} not found"
+    flash(message + ".", "success" if action == "approve" else "warning")
+    return _redirect_next(url_for(f"admin.{target}"))
+
+
 @bp.before_request
 def _admin_guard():
     # Extra guard even if a route forgets @roles_required.
@@ -72,27 +108,46 @@ def companies():
     q = (request.args.get("q") or "").strip()
     status = (request.args.get("status") or "").strip()
 
+    # The cache key and the filters share one normalized term, so differently
+    # spaced or cased queries never share an entry with different results.
+    term = normalize_query(q)
+
     query = Company.query.join(User, Company.user_id == User.id)
     if status:
         query = query.filter(Company.approval_status == status)
-    if q:
-        like = f"%{q}%"
+    if term:
+        like = f"%{term}%"
         filters = [
             Company.company_name.ilike(like),
             Company.industry.ilike(like),
             User.email.ilike(like),
         ]
-        if q.isdigit():
-            filters.append(Company.user_id == int(q))
+        if term.isdigit():
+            filters.append(Company.user_id == int(term))
         query = query.filter(or_(*filters))
 
-    items = query.order_by(Company.created_at.desc()).all()
+    items = cached_search(
+        "companies",
+        (term, status),
+        query.order_by(Company.created_at.desc()),
+        Company,
+        Company.user_id,
+    )
     return render_template("admin/companies.html", companies=items, q=q, status=status)
 
 
+@bp.post("/companies/bulk")
+@login_required
+@roles_required("admin")
+@write_transaction
+def bulk_companies():
+    return _bulk_moderate("companies", "company")
+
+
 @bp.post("/companies/<int:company_id>/approve")
 @login_required
 @roles_required("admin")
+@write_transaction
 def approve_company(company_id: int):
     company = Company.query.get_or_404(company_id)
     company.approval_status = "approved"
@@ -104,6 +159,7 @@ def approve_company(company_id: int):
 @bp.post("/companies/<int:company_id>/reject")
 @login_required
 @roles_required("admin")
+@write_transaction
 def reject_company(company_id: int):
     company = Company.query.get_or_404(company_id)
     company.approval_status = "rejected"
@@ -115,6 +171,7 @@ def reject_company(company_id: int):
 @bp.post("/companies/<int:company_id>/toggle-blacklist")
 @login_required
 @roles_required("admin")
+@write_transaction
 def toggle_company_blacklist(company_id: int):
     company = Company.query.get_or_404(company_id)
     company.is_blacklisted = not company.is_blacklisted
@@ -126,6 +183,7 @@ def toggle_company_blacklist(company_id: int):
 @bp.post("/companies/<int:company_id>/toggle-active")
 @login_required
 @roles_required("admin")
+@write_transaction
 def toggle_company_active(company_id: int):
     user = User.query.get_or_404(company_id)
     user.is_active = not user.is_active
@@ -148,27 +206,15 @@ def company_detail(company_id: int):
 @roles_required("admin")
 def students():
     q = (request.args.get("q") or "").strip()
-
-    query = Student.query.join(User, Student.user_id == User.id)
-    if q:
-        like = f"%{q}%"
-        filters = [
-            Student.full_name.ilike(like),
-            Student.student_uid.ilike(like),
-            Student.phone.ilike(like),
-            User.email.ilike(like),
-        ]
-        if q.isdigit():
-            filters.append(Student.user_id == int(q))
-        query = query.filter(or_(*filters))
-
-    items = query.order_by(Student.created_at.desc()).all()
+    term = normalize_query(q)
+    items = cached_search("students", (term,), student_search_query(term), Student, Student.user_id)
     return render_template("admin/students.html", students=items, q=q)
 
 
 @bp.post("/students/<int:student_id>/toggle-blacklist")
 @login_required
 @roles_required("admin")
+@write_transaction
 def toggle_student_blacklist(student_id: int):
     student = Student.query.get_or_404(student_id)
     student.is_blacklisted = not student.is_blacklisted
@@ -180,6 +226,7 @@ def toggle_student_blacklist(student_id: int):
 @bp.post("/students/<int:student_id>/toggle-active")
 @login_required
 @roles_required("admin")
+@write_transaction
 def toggle_student_active(student_id: int):
     user = User.query.get_or_404(student_id)
     user.is_active = not user.is_active
@@ -195,28 +242,45 @@ def drives():
     q = (request.args.get("q") or "").strip()
     status = (request.args.get("status") or "").strip()
 
+    term = normalize_query(q)
+
     query = Drive.query.join(Company, Drive.company_id == Company.user_id)
     if status:
         query = query.filter(Drive.status == status)
     query = query.filter(Drive.is_deleted.is_(False))
 
-    if q:
-        like = f"%{q}%"
+    if term:
+        like = f"%{term}%"
         filters = [
             Drive.job_title.ilike(like),
             Company.company_name.ilike(like),
         ]
-        if q.isdigit():
-            filters.append(Drive.id == int(q))
+        if term.isdigit():
+            filters.append(Drive.id == int(term))
         query = query.filter(or_(*filters))
 
-    items = query.order_by(Drive.created_at.desc()).all()
+    items = cached_search(
+        "drives",
+        (term, status),
+        query.order_by(Drive.created_at.desc()),
+        Drive,
+        Drive.id,
+    )
     return render_template("admin/drives.html", drives=items, q=q, status=status)
 
 
+@bp.post("/drives/bulk")
+@login_required
+@roles_required("admin")
+@write_transaction
+def bulk_drives():
+    return _bulk_moderate("drives", "drive")
+
+
 @bp.post("/drives/<int:drive_id>/approve")
 @login_required
 @roles_required("admin")
+@write_transaction
 def approve_drive(drive_id: int):
     drive = Drive.query.get_or_404(drive_id)
     drive.status = "approved"
@@ -228,6 +292,7 @@ def approve_drive(drive_id: int):
 @bp.post("/drives/<int:drive_id>/reject")
 @login_required
 @roles_required("admin")
+@write_transaction
 def reject_drive(drive_id: int):
     drive = Drive.query.get_or_404(drive_id)
     drive.status = "rejected"
@@ -241,10 +306,7 @@ def reject_drive(drive_id: int):
 @roles_required("admin")
 def drive_detail(drive_id: int):
     drive = Drive.query.get_or_404(drive_id)
-    application_count = Application.query.filter_by(drive_id=drive.id).count()
-    return render_template(
-        "admin/drive_detail.html", drive=drive, application_count=application_count
-    )
+    return render_template("admin/drive_detail.html", drive=drive)
 
 
 @bp.get("/applications")
@@ -253,27 +315,23 @@ def drive_detail(drive_id: int):
 def applications():
     q = (request.args.get("q") or "").strip()
 
-    query = (
-        Application.query.join(Student, Application.student_id == Student.user_id)
-        .join(User, Student.user_id == User.id)
-        .join(Drive, Application.drive_id == Drive.id)
-        .join(Company, Drive.company_id == Company.user_id)
-    )
+    # Names are denormalized onto applications; only email search needs `users`.
+    query = application_rows()
 
     if q:
         like = f"%{q}%"
         filters = [
-            User.email.ilike(like),
-            Student.full_name.ilike(like),
-            Student.student_uid.ilike(like),
-            Drive.job_title.ilike(like),
-            Company.company_name.ilike(like),
+            Application.student_id.in_(select(User.id).where(User.email.ilike(like))),
+            Application.student_name.ilike(like),
+            Application.student_uid.ilike(like),
+            Application.job_title.ilike(like),
+            Application.company_name.ilike(like),
         ]
         if q.isdigit():
             filters.append(Application.id == int(q))
-        query = query.filter(or_(*filters))
+        query = query.where(or_(*filters))
 
-    items = query.order_by(Application.application_date.desc()).all()
+    items = db.session.execute(query.order_by(Application.application_date.desc())).all()
     return render_template("admin/applications.html", applications=items, q=q)
 
 
@@ -283,22 +341,18 @@ def applications():
 def placements():
     q = (request.args.get("q") or "").strip()
 
-    query = (
-        Placement.query.join(Application, Placement.application_id == Application.id)
-        .join(Student, Application.student_id == Student.user_id)
-        .join(User, Student.user_id == User.id)
-        .join(Drive, Application.drive_id == Drive.id)
-        .join(Company, Drive.company_id == Company.user_id)
+    query = Placement.query.join(Application, Placement.application_id == Application.id).options(
+        contains_eager(Placement.application)
     )
 
     if q:
         like = f"%{q}%"
         filters = [
-            User.email.ilike(like),
-            Student.full_name.ilike(like),
-            Student.student_uid.ilike(like),
-            Company.company_name.ilike(like),
-            Drive.job_title.ilike(like),
+            Application.student_id.in_(select(User.id).where(User.email.ilike(like))),
+            Application.student_name.ilike(like),
+            Application.student_uid.ilike(like),
+            Application.company_name.ilike(like),
+            Application.job_title.ilike(like),
         ]
         if q.isdigit():
             filters.append(Placement.id == int(q))
@@ -306,3 +360,26 @@ def placements():
 
     items = query.order_by(Placement.placed_on.desc()).all()
     return render_template("admin/placements.html", placements=items, q=q)
+
+
+@bp.get("/profiles")
+@login_required
+@roles_required("admin")
+def profiles():
+    enabled = current_app.config["PROFILER_ENABLED"]
+    return render_template(
+        "admin/profiles.html",
+        enabled=enabled,
+        header=current_app.config["PROFILER_HEADER"],
+        token=make_profile_token(current_user.id) if enabled else None,
+        profiles=list_profiles(current_app),
+    )
+
+
+@bp.get("/profiles/<path:name>")
+@login_required
+@roles_required("admin")
+def download_profile(name: str):
+    if not name.endswith(".pstats"):
+        abort(404)
+    return send_from_directory(profiles_dir(current_app), name, as_attachment=True)
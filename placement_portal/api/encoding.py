@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+
+from flask import Response, request
+
+# Optional accelerators: `pip install orjson msgpack`. Without them responses
+# use the stdlib encoder and MessagePack is simply not offered.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MIMETYPE = "application/json"
+MSGPACK_MIMETYPE = "application/msgpack"
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def dumps_json(data) -> bytes:
+    """Encode `data` as JSON; dates and datetimes become ISO 8601 strings."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def dumps_msgpack(data) -> bytes:
+    return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+def wants_msgpack() -> bool:
+    """True when the client prefers `Accept: application/msgpack` and it is installed."""
+    if msgpack is None:
+        return False
+    best = request.accept_mimetypes.best_match([JSON_MIMETYPE, MSGPACK_MIMETYPE])
+    return best == MSGPACK_MIMETYPE
+
+
+def encode_response(data, status: int = 200, headers=None) -> Response:
+    """Build the API response for `data` in the negotiated format."""
+    if wants_msgpack():
+        body, mimetype = dumps_msgpack(data), MSGPACK_MIMETYPE
+    else:
+        body, mimetype = dumps_json(data), JSON_MIMETYPE
+    response = Response(body, status=status, mimetype=mimetype, headers=headers)
+    response.vary.add("Accept")
+    return response
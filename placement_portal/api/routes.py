@@ -2,22 +2,47 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from flask import Blueprint, abort, jsonify, request
+from flask import Blueprint, Response, abort, current_app, g, request, stream_with_context
 from flask_login import current_user, login_user, logout_user
-from sqlalchemy import or_
-from werkzeug.exceptions import HTTPException
+from sqlalchemy import Select, func, inspect as sa_inspect, or_, select
+from werkzeug.exceptions import HTTPException, TooManyRequests
 
+from .. import metrics
+from ..applications import submit_application
 from ..decorators import roles_required
 from ..extensions import csrf, db
-from ..models import Application, Company, Drive, Notification, Placement, Student, User
+from ..health import readiness
+from ..models import (
+    Application,
+    Company,
+    Drive,
+    Notification,
+    NotificationArchive,
+    Placement,
+    Student,
+    User,
+)
+from ..moderation import ACTIONS as MODERATION_ACTIONS, TARGETS as MODERATION_TARGETS, moderate
+from ..passwords import rehash_if_outdated
+from ..ranking import SORTS as RANKING_SORTS, applicant_page
+from ..ratelimit import login_retry_after
+from ..readmodels import application_rows, drive_rows
+from ..suggest import KINDS as SUGGEST_KINDS, get_suggest_index
+from ..transactions import write_transaction
+from ..trigrams import student_search_query
+from .encoding import dumps_json, encode_response, wants_msgpack
 from .serializers import (
+    application_row_to_dict,
     application_to_dict,
+    archived_notification_to_dict,
     company_to_dict,
+    drive_row_to_dict,
     drive_to_dict,
     notification_to_dict,
     student_to_dict,
     user_to_dict,
 )
+from .stream import event_stream, get_hub
 
 
 bp = Blueprint("api", __name__)
@@ -26,9 +51,12 @@ csrf.exempt(bp)
 
 @bp.errorhandler(HTTPException)
 def _http_error(err: HTTPException):
-    return (
-        jsonify({"success": False, "error": err.name, "description": err.description}),
+    # Keep headers such as Retry-After (429/503) from the original exception.
+    headers = [(k, v) for k, v in err.get_headers() if k.lower() != "content-type"]
+    return encode_response(
+        {"success": False, "error": err.name, "description": err.description},
         err.code,
+        headers,
     )
 
 
@@ -40,7 +68,74 @@ def _ok(data=None, status: int = 200):
     payload = {"success": True}
     if data is not None:
         payload["data"] = data
-    return jsonify(payload), status
+    return encode_response(payload), status
+
+
+def _rows(query, session=None):
+    """Iterate a `Model.query` or a Core `select()` from readmodels.py."""
+    if isinstance(query, Select):
+        return (session or db.session).execute(query)
+    return query if session is None else query.with_session(session)
+
+
+def _ok_list(key: str, query, serializer):
+    """`_ok({key: [serializer(row), ...]})` for list endpoints, streamed when large.
+
+    Up to API_STREAM_THRESHOLD rows are returned through `_ok`. Beyond that
+    (or with `?stream=1`) the JSON envelope is written incrementally from a
+    `yield_per` query, so neither the full row list nor the full JSON string is
+    held in memory. Errors after the first chunk can no longer change the
+    status code and end the response early. MessagePack and /api/batch
+    sub-requests are never streamed.
+    """
+    if wants_msgpack() or g.get("api_batch"):
+        return _ok({key: [serializer(row) for row in _rows(query)]})
+    if request.args.get("stream") != "1":
+        threshold = current_app.config["API_STREAM_THRESHOLD"]
+        if _count_up_to(query, threshold + 1) <= threshold:
+            return _ok({key: [serializer(row) for row in _rows(query)]})
+
+    body = _stream_list(key, query, serializer)
+    return Response(stream_with_context(body), mimetype="application/json"), 200
+
+
+def _count_up_to(query, limit: int) -> int:
+    """Rows `query` returns, counting no further than `limit`.
+
+    Only the first key column is selected and the ordering dropped, so the
+    probe loads no rows. The streamed body cannot reuse a result opened here:
+    teardown closes the view's session before the body is iterated.
+    """
+    if isinstance(query, Select):
+        probe = query.with_only_columns(query.selected_columns[0], maintain_column_froms=True)
+    else:
+        entity = query.column_descriptions[0]["entity"]
+        probe = query.with_entities(sa_inspect(entity).primary_key[0])
+    probe = probe.order_by(None).limit(limit).subquery()
+    return db.session.scalar(select(func.count()).select_from(probe))
+
+
+def _stream_list(key: str, query, serializer):
+    # Teardown has already removed the view's session by the time the body is
+    # iterated, so the query is re-bound to the session of the re-pushed context.
+    batch_size = current_app.config["API_STREAM_BATCH_SIZE"]
+    if isinstance(query, Select):
+        query = query.execution_options(yield_per=batch_size)
+    else:
+        # Query.yield_per also turns off the legacy result uniquing, which the
+        # bare execution option would trip over.
+        query = query.yield_per(batch_size)
+    rows = _rows(query, db.session())
+    chunk = [b'{"success":true,"data":{', dumps_json(key), b":["]
+    for index, row in enumerate(rows):
+        if index:
+            chunk.append(b",")
+        chunk.append(dumps_json(serializer(row)))
+        if len(chunk) >= batch_size:
+            yield b"".join(chunk)
+            chunk = []
+    chunk.append(b"]}}")
+    yield b"".join(chunk)
 
 
 def _require_company_ok(user: User, company: Company | None) -> None:
@@ -59,6 +154,160 @@ def health():
     return _ok({"status": "ok", "server_time": datetime.utcnow().isoformat()})
 
 
+@bp.get("/health/live")
+def health_live():
+    """Liveness: the worker answers requests. Never touches the database."""
+    return _ok({"status": "alive"})
+
+
+@bp.get("/health/ready")
+def health_ready():
+    """Readiness: DB latency, SQLite write lock, WAL size and upload disk space.
+
+    Any failed check turns the response into a 503 so load balancers stop
+    routing to this worker; the body lists every check either way.
+    """
+    ok, checks = readiness()
+    if not ok:
+        metrics.incr("health_not_ready")
+    return encode_response(
+        {"success": ok, "data": {"status": "ready" if ok else "unavailable", "checks": checks}},
+        200 if ok else 503,
+        {"Cache-Control": "no-store"},
+    )
+
+
+@bp.get("/metrics")
+@roles_required("admin")
+def get_metrics():
+    """Process-local counters of this worker (lock retries, rejections, ...)."""
+    return _ok({"metrics": metrics.snapshot()})
+
+
+@bp.get("/suggest")
+def suggest():
+    """Typeahead for search boxes: ?kind=company|title|skill&prefix=...&limit=..."""
+    kind = (request.args.get("kind") or "").strip()
+    if kind not in SUGGEST_KINDS:
+        abort(400, description=f"kind must be one of: {', '.join(SUGGEST_KINDS)}.")
+    prefix = (request.args.get("prefix") or "").strip()
+    limit = request.args.get("limit", type=int) or current_app.config["SUGGEST_LIMIT"]
+    limit = max(1, min(limit, 50))
+
+    suggestions = get_suggest_index().lookup(kind, prefix, limit) if prefix else []
+    return _ok({"kind": kind, "prefix": prefix, "suggestions": suggestions})
+
+
+@bp.post("/admin/moderation")
+@roles_required("admin")
+@write_transaction
+def bulk_moderation():
+    """Approve/reject many companies or drives in one transaction.
+
+    Body: {"target": "companies"|"drives", "action": "approve"|"reject", "ids": [...]}
+    """
+    payload = _json()
+    target = payload.get("target")
+    action = payload.get("action")
+    ids = payload.get("ids")
+    if target not in MODERATION_TARGETS:
+        abort(400, description=f"target must be one of: {', '.join(MODERATION_TARGETS)}.")
+    if action not in MODERATION_ACTIONS:
+        abort(400, description=f"action must be one of: {', '.join(MODERATION_ACTIONS)}.")
+    if not isinstance(ids, list) or not ids or not all(type(i) is int for i in ids):
+        abort(400, description="ids must be a non-empty list of integers.")
+    max_ids = current_app.config["MODERATION_MAX_IDS"]
+    if len(ids) > max_ids:
+        abort(400, description=f"At most {max_ids} ids are allowed per call.")
+
+    results = moderate(target, action, ids)
+    return _ok(
+        {
+            "target": target,
+            "action": action,
+            "results": [{"id": i, "result": r} for i, r in results.items()],
+            "updated": sum(r == "updated" for r in results.values()),
+        }
+    )
+
+
+# --- Batch ---
+
+
+def _batch_error(result: dict, description: str, status: int = 400, error: str = "Bad Request") -> dict:
+    result.update(
+        status=status,
+        body={"success": False, "error": error, "description": description},
+    )
+    return result
+
+
+def _dispatch_batch_item(item) -> dict:
+    """Run one read-only sub-request through the app and capture its result.
+
+    The sub-request reuses the current app context, so it shares the DB session
+    and the already-loaded `current_user` with the outer request.
+    """
+    if not isinstance(item, dict):
+        return _batch_error({}, "Each request must be an object.")
+
+    method = (item.get("method") or "GET").strip().upper()
+    path = (item.get("path") or "").strip()
+    result = {"id": item.get("id"), "path": path}
+
+    if method != "GET":
+        return _batch_error(result, "Only GET sub-requests are supported.")
+    if not path.startswith("/api/") or path.split("?", 1)[0].rstrip("/") == request.path:
+        return _batch_error(result, "path must be an /api/ endpoint other than /api/batch.")
+
+    headers = {}
+    if request.headers.get("Cookie"):
+        headers["Cookie"] = request.headers["Cookie"]
+
+    with current_app.test_request_context(
+        path, method="GET", base_url=request.host_url, headers=headers
+    ):
+        try:
+            response = current_app.full_dispatch_request()
+        except Exception:
+            # Only HTTPExceptions have a handler here; keep other failures to
+            # their own entry instead of failing the whole batch.
+            current_app.logger.exception("Batch sub-request failed: %s", path)
+            db.session.rollback()
+            return _batch_error(result, "The sub-request failed.", 500, "Internal Server Error")
+
+    try:
+        if response.is_streamed:
+            # Event streams never end; list endpoints are buffered for batches.
+            return _batch_error(result, "Streaming endpoints cannot be batched.")
+        result.update(status=response.status_code, body=response.get_json(silent=True))
+        return result
+    finally:
+        response.close()
+
+
+@bp.post("/batch")
+def batch():
+    """Execute several GET /api/* calls in one round trip.
+
+    Body: {"requests": [{"id": "me", "method": "GET", "path": "/api/me"}, ...]}
+    Each sub-request keeps its own status code; the batch itself returns 200.
+    """
+    items = _json().get("requests")
+    if not isinstance(items, list) or not items:
+        abort(400, description="requests must be a non-empty list.")
+
+    max_items = current_app.config["API_BATCH_MAX_REQUESTS"]
+    if len(items) > max_items:
+        abort(400, description=f"At most {max_items} requests are allowed per batch.")
+
+    # Load the user once here; sub-requests share it through the app context's `g`.
+    current_user._get_current_object()
+    g.api_batch = True
+
+    return _ok({"responses": [_dispatch_batch_item(item) for item in items]})
+
+
 # --- Session / Auth (JSON) ---
 
 
@@ -71,6 +320,10 @@ def create_session():
     if not email or not password:
         abort(400, description="email and password are required.")
 
+    retry_after = login_retry_after(email)
+    if retry_after:
+        raise TooManyRequests("Too many login attempts.", retry_after=retry_after)
+
     user = User.query.filter_by(email=email).first()
     if user is None or not user.check_password(password):
         abort(401, description="Invalid email or password.")
@@ -88,6 +341,7 @@ def create_session():
         if student.is_blacklisted:
             abort(403, description="Student is blacklisted.")
 
+    rehash_if_outdated(user, password)
     login_user(user)
     return _ok({"user": user_to_dict(user)}, status=200)
 
@@ -112,22 +366,7 @@ def me():
 @roles_required("admin")
 def list_students():
     q = (request.args.get("q") or "").strip()
-    query = Student.query.join(User, Student.user_id == User.id)
-
-    if q:
-        like = f"%{q}%"
-        filters = [
-            Student.full_name.ilike(like),
-            Student.student_uid.ilike(like),
-            Student.phone.ilike(like),
-            User.email.ilike(like),
-        ]
-        if q.isdigit():
-            filters.append(Student.user_id == int(q))
-        query = query.filter(or_(*filters))
-
-    items = query.order_by(Student.created_at.desc()).all()
-    return _ok({"students": [student_to_dict(s) for s in items]})
+    return _ok_list("students", student_search_query(q), student_to_dict)
 
 
 @bp.get("/students/<int:student_id>")
@@ -144,6 +383,7 @@ def get_student(student_id: int):
 
 @bp.route("/students/<int:student_id>", methods=["PATCH", "PUT"])
 @roles_required("admin", "student")
+@write_transaction
 def update_student(student_id: int):
     student = Student.query.get_or_404(student_id)
     if current_user.role == "student" and current_user.id != student.user_id:
@@ -179,6 +419,7 @@ def update_student(student_id: int):
 
 @bp.delete("/students/<int:student_id>")
 @roles_required("admin")
+@write_transaction
 def deactivate_student(student_id: int):
     user = User.query.get_or_404(student_id)
     if user.role != "student":
@@ -212,8 +453,7 @@ def list_companies():
             filters.append(Company.user_id == int(q))
         query = query.filter(or_(*filters))
 
-    items = query.order_by(Company.created_at.desc()).all()
-    return _ok({"companies": [company_to_dict(c) for c in items]})
+    return _ok_list("companies", query.order_by(Company.created_at.desc()), company_to_dict)
 
 
 @bp.get("/companies/<int:company_id>")
@@ -230,6 +470,7 @@ def get_company(company_id: int):
 
 @bp.route("/companies/<int:company_id>", methods=["PATCH", "PUT"])
 @roles_required("admin", "company")
+@write_transaction
 def update_company(company_id: int):
     company = Company.query.get_or_404(company_id)
     if current_user.role == "company" and current_user.id != company.user_id:
@@ -265,6 +506,7 @@ def update_company(company_id: int):
 
 @bp.delete("/companies/<int:company_id>")
 @roles_required("admin")
+@write_transaction
 def deactivate_company(company_id: int):
     user = User.query.get_or_404(company_id)
     if user.role != "company":
@@ -282,42 +524,33 @@ def list_drives():
     q = (request.args.get("q") or "").strip()
     status = (request.args.get("status") or "").strip()
 
-    query = Drive.query.join(Company, Drive.company_id == Company.user_id).filter(Drive.is_deleted.is_(False))
-
-    if current_user.is_authenticated:
-        if current_user.role == "admin":
-            pass
-        elif current_user.role == "company":
-            query = query.filter(Drive.company_id == current_user.id)
-        else:
-            query = query.filter(
-                Drive.status == "approved",
-                Company.approval_status == "approved",
-                Company.is_blacklisted.is_(False),
-            ).filter((Drive.application_deadline.is_(None)) | (Drive.application_deadline >= date.today()))
+    query = drive_rows().where(Drive.is_deleted.is_(False))
+
+    if current_user.is_authenticated and current_user.role == "admin":
+        pass
+    elif current_user.is_authenticated and current_user.role == "company":
+        query = query.where(Drive.company_id == current_user.id)
     else:
-        query = query.filter(
-            Drive.status == "approved",
-            Company.approval_status == "approved",
-            Company.is_blacklisted.is_(False),
-        ).filter((Drive.application_deadline.is_(None)) | (Drive.application_deadline >= date.today()))
+        # Students and anonymous visitors: the maintained flag covers drive and
+        # company approval, blacklisting and deletion in one indexed column.
+        query = query.where(Drive.is_visible.is_(True))
 
     if status:
-        query = query.filter(Drive.status == status)
+        query = query.where(Drive.status == status)
     if q:
         like = f"%{q}%"
-        query = query.filter(
+        query = query.where(
             (Drive.job_title.ilike(like))
             | (Company.company_name.ilike(like))
             | (Drive.required_skills.ilike(like))
         )
 
-    items = query.order_by(Drive.created_at.desc()).all()
-    return _ok({"drives": [drive_to_dict(d) for d in items]})
+    return _ok_list("drives", query.order_by(Drive.created_at.desc()), drive_row_to_dict)
 
 
 @bp.post("/drives")
 @roles_required("company")
+@write_transaction
 def create_drive():
     company = current_user.company_profile
     _require_company_ok(current_user, company)
@@ -374,8 +607,48 @@ def create_drive():
     return _ok({"drive": drive_to_dict(drive)}, status=201)
 
 
+@bp.get("/drives/<int:drive_id>/applicants")
+@roles_required("admin", "company")
+def list_drive_applicants(drive_id: int):
+    """Applicants of a drive, best match first (?sort=date for newest first)."""
+    drive = Drive.query.get_or_404(drive_id)
+    if current_user.role == "company":
+        _require_company_ok(current_user, current_user.company_profile)
+        if drive.company_id != current_user.id:
+            abort(403, description="Not your drive.")
+
+    sort = request.args.get("sort", "rank")
+    if sort not in RANKING_SORTS:
+        abort(400, description=f"sort must be one of: {', '.join(RANKING_SORTS)}.")
+    page = max(request.args.get("page", type=int) or 1, 1)
+    per_page = request.args.get("per_page", type=int) or current_app.config["APPLICANTS_PER_PAGE"]
+    per_page = max(1, min(per_page, 100))
+
+    applicants, total = applicant_page(drive, sort, page, per_page)
+    return _ok(
+        {
+            "drive_id": drive.id,
+            "sort": sort,
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "applicants": [
+                {
+                    **application_row_to_dict(r.application),
+                    "cgpa": r.application.cgpa,
+                    "skill_match": r.skill_match,
+                    "matched_skills": r.matched_skills,
+                    "score": r.score,
+                }
+                for r in applicants
+            ],
+        }
+    )
+
+
 @bp.route("/drives/<int:drive_id>", methods=["PATCH", "PUT"])
 @roles_required("admin", "company")
+@write_transaction
 def update_drive(drive_id: int):
     drive = Drive.query.get_or_404(drive_id)
     data = _json()
@@ -458,6 +731,7 @@ def update_drive(drive_id: int):
 
 @bp.delete("/drives/<int:drive_id>")
 @roles_required("company")
+@write_transaction
 def delete_drive(drive_id: int):
     drive = Drive.query.get_or_404(drive_id)
     company = current_user.company_profile
@@ -479,28 +753,29 @@ def list_applications():
     drive_id = request.args.get("drive_id")
     student_id = request.args.get("student_id")
 
-    query = Application.query.join(Drive, Application.drive_id == Drive.id).join(
-        Company, Drive.company_id == Company.user_id
-    )
+    query = application_rows()
 
     if current_user.role == "admin":
         pass
     elif current_user.role == "company":
         company = current_user.company_profile
         _require_company_ok(current_user, company)
-        query = query.filter(Drive.company_id == current_user.id)
+        query = query.where(Application.company_id == current_user.id)
     else:
-        query = query.filter(Application.student_id == current_user.id)
+        query = query.where(Application.student_id == current_user.id)
 
     if status:
-        query = query.filter(Application.status == status)
+        query = query.where(Application.status == status)
     if drive_id and str(drive_id).isdigit():
-        query = query.filter(Application.drive_id == int(drive_id))
+        query = query.where(Application.drive_id == int(drive_id))
     if student_id and str(student_id).isdigit() and current_user.role == "admin":
-        query = query.filter(Application.student_id == int(student_id))
+        query = query.where(Application.student_id == int(student_id))
 
-    items = query.order_by(Application.application_date.desc()).all()
-    return _ok({"applications": [application_to_dict(a) for a in items]})
+    return _ok_list(
+        "applications",
+        query.order_by(Application.application_date.desc()),
+        application_row_to_dict,
+    )
 
 
 @bp.get("/applications/<int:application_id>")
@@ -522,6 +797,7 @@ def get_application(application_id: int):
 
 @bp.post("/applications")
 @roles_required("student")
+@write_transaction
 def create_application():
     data = _json()
     drive_id = data.get("drive_id")
@@ -529,25 +805,34 @@ def create_application():
         abort(400, description="drive_id is required.")
 
     drive = Drive.query.get_or_404(int(drive_id))
-    if drive.is_deleted or drive.status != "approved":
-        abort(400, description="Drive is not available.")
-    if drive.company.approval_status != "approved" or drive.company.is_blacklisted:
+    if not drive.is_visible:
         abort(400, description="Drive is not available.")
     if drive.application_deadline and drive.application_deadline < date.today():
         abort(400, description="Application deadline has passed.")
 
-    existing = Application.query.filter_by(student_id=current_user.id, drive_id=drive.id).first()
-    if existing is not None:
-        return _ok({"application": application_to_dict(existing), "message": "already_applied"}, status=200)
+    idempotency_key = (request.headers.get("Idempotency-Key") or "").strip() or None
+    if idempotency_key is not None and len(idempotency_key) > 64:
+        abort(400, description="Idempotency-Key must be at most 64 characters.")
 
-    app = Application(student_id=current_user.id, drive_id=drive.id, status="applied")
-    db.session.add(app)
+    try:
+        app, created = submit_application(current_user.id, drive.id, idempotency_key)
+    except ValueError as e:
+        abort(422, description=str(e))
     db.session.commit()
-    return _ok({"application": application_to_dict(app)}, status=201)
+
+    if created:
+        return _ok({"application": application_to_dict(app)}, status=201)
+    if idempotency_key is not None and app.idempotency_key == idempotency_key:
+        # Retry of the request that created this application: replay its response.
+        response, status = _ok({"application": application_to_dict(app)}, status=201)
+        response.headers["Idempotent-Replayed"] = "true"
+        return response, status
+    return _ok({"application": application_to_dict(app), "message": "already_applied"}, status=200)
 
 
 @bp.route("/applications/<int:application_id>", methods=["PATCH", "PUT"])
 @roles_required("admin", "company")
+@write_transaction
 def update_application(application_id: int):
     data = _json()
     status = (data.get("status") or "").strip().lower()
@@ -583,6 +868,7 @@ def update_application(application_id: int):
 
 @bp.delete("/applications/<int:application_id>")
 @roles_required("student")
+@write_transaction
 def withdraw_application(application_id: int):
     """Allow students to withdraw only if still in 'applied' status."""
     app = Application.query.get_or_404(application_id)
@@ -602,6 +888,10 @@ def withdraw_application(application_id: int):
 @bp.get("/notifications")
 @roles_required("student")
 def list_notifications():
+    """Latest 50 notifications, or `?archived=1&before_id=` to page old history."""
+    if request.args.get("archived") in {"1", "true"}:
+        return _list_archived_notifications()
+
     items = (
         Notification.query.filter_by(user_id=current_user.id)
         .order_by(Notification.created_at.desc())
@@ -611,8 +901,105 @@ def list_notifications():
     return _ok({"notifications": [notification_to_dict(n) for n in items]})
 
 
+def _list_archived_notifications():
+    limit = request.args.get("limit", type=int) or 50
+    limit = max(1, min(limit, 200))
+    before_id = request.args.get("before_id", type=int)
+
+    query = NotificationArchive.query.filter(NotificationArchive.user_id == current_user.id)
+    if before_id is not None:
+        query = query.filter(NotificationArchive.id < before_id)
+    items = query.order_by(NotificationArchive.id.desc()).limit(limit).all()
+
+    next_before_id = items[-1].id if len(items) == limit else None
+    return _ok(
+        {
+            "notifications": [archived_notification_to_dict(n) for n in items],
+            "next_before_id": next_before_id,
+        }
+    )
+
+
+@bp.get("/notifications/stream")
+@roles_required("student")
+def stream_notifications():
+    """Push new notifications as Server-Sent Events.
+
+    Reconnecting clients send `Last-Event-ID` (or `?last_event_id=`) and get
+    the notifications they missed replayed before live events, or a single
+    `resync` event when more than NOTIFICATION_STREAM_REPLAY_LIMIT were missed.
+    """
+    raw_last_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    last_id = int(raw_last_id) if raw_last_id and raw_last_id.isdigit() else None
+
+    user_id = current_user.id
+    hub = get_hub()
+    # Subscribe before reading the backlog so nothing created in between is lost;
+    # duplicates are skipped by id inside the stream.
+    q = hub.subscribe(user_id)
+
+    config = current_app.config
+    backlog = []
+    resync_id = None
+    try:
+        if last_id is not None:
+            limit = config["NOTIFICATION_STREAM_REPLAY_LIMIT"]
+            rows = (
+                Notification.query.filter(Notification.user_id == user_id, Notification.id > last_id)
+                .order_by(Notification.id.asc())
+                .limit(limit + 1)
+                .all()
+            )
+            if len(rows) > limit:
+                # Too far behind to replay: send a `resync` event instead, positioned
+                # at the newest row so the live part carries on from there.
+                resync_id = db.session.scalar(
+                    select(func.max(Notification.id)).where(Notification.user_id == user_id)
+                )
+            else:
+                backlog = [notification_to_dict(n) for n in rows]
+    except BaseException:
+        hub.unsubscribe(user_id, q)
+        raise
+
+    response = Response(
+        event_stream(
+            hub,
+            user_id,
+            q,
+            backlog,
+            heartbeat=config["NOTIFICATION_STREAM_HEARTBEAT_SECONDS"],
+            max_seconds=config["NOTIFICATION_STREAM_MAX_SECONDS"],
+            resync_id=resync_id,
+        ),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # event_stream only unsubscribes once iterated; HEAD requests, batch
+    # sub-requests and clients gone before the first chunk just close it.
+    response.call_on_close(lambda: hub.unsubscribe(user_id, q))
+    return response
+
+
+@bp.get("/notifications/unread-count")
+@roles_required("student")
+def unread_notification_count():
+    # Served from the counter on the already-loaded user row: no extra query.
+    return _ok({"unread_count": current_user.unread_notification_count})
+
+
+@bp.post("/notifications/read-all")
+@roles_required("student")
+@write_transaction
+def mark_all_notifications_read():
+    marked = Notification.mark_all_read(current_user.id)
+    db.session.commit()
+    return _ok({"marked_read": marked, "unread_count": 0})
+
+
 @bp.post("/notifications/<int:notification_id>/read")
 @roles_required("student")
+@write_transaction
 def mark_notification_read(notification_id: int):
     notif = Notification.query.get_or_404(notification_id)
     if notif.user_id != current_user.id:
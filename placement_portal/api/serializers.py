@@ -2,14 +2,23 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from ..models import Application, Company, Drive, Notification, Placement, Student, User
+from ..models import (
+    Application,
+    Company,
+    Drive,
+    Notification,
+    NotificationArchive,
+    Placement,
+    Student,
+    User,
+)
 
 
 def _iso(value):
-    if value is None:
-        return None
-    if isinstance(value, (datetime, date)):
-        return value.isoformat()
+    # Dates and datetimes are passed through; the response encoder
+    # (api/encoding.py) writes them as ISO 8601 strings.
+    if value is None or isinstance(value, (datetime, date)):
+        return value
     return str(value)
 
 
@@ -86,15 +95,16 @@ def drive_to_dict(drive: Drive) -> dict:
 
 
 def application_to_dict(app: Application) -> dict:
+    # Names come from the denormalized columns on the row itself (no joins).
     return {
         "id": app.id,
         "student_id": app.student_id,
-        "student_name": app.student.full_name if app.student else None,
-        "student_uid": app.student.student_uid if app.student else None,
+        "student_name": app.student_name,
+        "student_uid": app.student_uid,
         "drive_id": app.drive_id,
-        "drive_title": app.drive.job_title if app.drive else None,
-        "company_id": app.drive.company_id if (app.drive is not None) else None,
-        "company_name": app.drive.company.company_name if (app.drive and app.drive.company) else None,
+        "drive_title": app.job_title,
+        "company_id": app.company_id,
+        "company_name": app.company_name,
         "status": app.status,
         "application_date": _iso(app.application_date),
         "updated_at": _iso(app.updated_at),
@@ -102,6 +112,47 @@ def application_to_dict(app: Application) -> dict:
     }
 
 
+def drive_row_to_dict(row) -> dict:
+    """`drive_to_dict` for a `readmodels.drive_rows()` row."""
+    return {
+        "id": row.id,
+        "company_id": row.company_id,
+        "company_name": row.company_name,
+        "job_title": row.job_title,
+        "job_description": row.job_description,
+        "eligibility_criteria": row.eligibility_criteria,
+        "required_skills": row.required_skills,
+        "min_cgpa": row.min_cgpa,
+        "salary_min": row.salary_min,
+        "salary_max": row.salary_max,
+        "location": row.location,
+        "min_experience_years": row.min_experience_years,
+        "application_deadline": row.application_deadline,
+        "status": row.status,
+        "is_deleted": bool(row.is_deleted),
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+    }
+
+
+def application_row_to_dict(row) -> dict:
+    """`application_to_dict` for a `readmodels.application_rows()` row."""
+    return {
+        "id": row.id,
+        "student_id": row.student_id,
+        "student_name": row.student_name,
+        "student_uid": row.student_uid,
+        "drive_id": row.drive_id,
+        "drive_title": row.job_title,
+        "company_id": row.company_id,
+        "company_name": row.company_name,
+        "status": row.status,
+        "application_date": row.application_date,
+        "updated_at": row.updated_at,
+        "placement_id": row.placement_id,
+    }
+
+
 def placement_to_dict(placement: Placement) -> dict:
     return {
         "id": placement.id,
@@ -121,3 +172,13 @@ def notification_to_dict(notification: Notification) -> dict:
         "created_at": _iso(notification.created_at),
     }
 
+
+def archived_notification_to_dict(notification: NotificationArchive) -> dict:
+    return {
+        "id": notification.id,
+        "user_id": notification.user_id,
+        "message": notification.message,
+        "is_read": True,
+        "archived": True,
+        "created_at": _iso(notification.created_at),
+    }
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+
+from flask import Flask, current_app
+from sqlalchemy import func, select
+
+from ..extensions import db
+from ..models import Notification
+from .encoding import dumps_json
+from .serializers import notification_to_dict
+
+_hub_lock = threading.Lock()
+
+
+class NotificationHub:
+    """In-process pub/sub for new notifications.
+
+    A single background thread per worker polls the `notifications` table for
+    rows newer than the last seen id and fans them out to the queues of the
+    connected students, so N open streams cost one DB query per poll interval.
+    """
+
+    def __init__(self, app: Flask, poll_interval: float, queue_size: int = 100):
+        self._app = app
+        self._poll_interval = poll_interval
+        self._queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers: dict[int, set[queue.Queue]] = {}
+        self._last_id: int | None = None
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, user_id: int) -> queue.Queue:
+        """Register a queue for `user_id`; call inside the request's app context.
+
+        Without a cursor (first subscriber, or the hub went idle) it starts at
+        the current newest id, so everything created after this call is
+        published to the new queue.
+        """
+        q: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        with self._lock:
+            if self._last_id is None:
+                self._last_id = db.session.scalar(select(func.max(Notification.id))) or 0
+            self._subscribers.setdefault(user_id, set()).add(q)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="notification-hub", daemon=True
+                )
+                self._thread.start()
+        return q
+
+    def unsubscribe(self, user_id: int, q: queue.Queue) -> None:
+        with self._lock:
+            queues = self._subscribers.get(user_id)
+            if queues is None:
+                return
+            queues.discard(q)
+            if not queues:
+                del self._subscribers[user_id]
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self._poll_interval)
+            with self._lock:
+                idle = not self._subscribers
+                if idle:
+                    # Nobody is listening: forget the cursor so we don't replay a
+                    # backlog to the next subscriber (they resume via Last-Event-ID).
+                    self._last_id = None
+            if idle:
+                continue
+            try:
+                self._poll()
+            except Exception:  # keep the hub alive across transient DB errors
+                self._app.logger.exception("Notification hub poll failed")
+
+    def _poll(self) -> None:
+        with self._lock:
+            last_id = self._last_id
+        if last_id is None:
+            return
+
+        with self._app.app_context():
+            rows = (
+                Notification.query.filter(Notification.id > last_id)
+                .order_by(Notification.id.asc())
+                .limit(500)
+                .all()
+            )
+            if not rows:
+                return
+            items = [notification_to_dict(n) for n in rows]
+
+        with self._lock:
+            # A subscriber may have re-seeded the cursor meanwhile; never move it back.
+            self._last_id = max(self._last_id or 0, items[-1]["id"])
+            for item in items:
+                for q in self._subscribers.get(item["user_id"], ()):
+                    try:
+                        q.put_nowait(item)
+                    except queue.Full:
+                        # Slow consumer: end its stream; the client reconnects
+                        # with Last-Event-ID and replays from the database.
+                        _force_put(q, None)
+
+
+def _force_put(q: queue.Queue, item) -> None:
+    try:
+        q.get_nowait()
+    except queue.Empty:
+        pass
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        pass
+
+
+def get_hub() -> NotificationHub:
+    app = current_app._get_current_object()
+    with _hub_lock:
+        hub = app.extensions.get("notification_hub")
+        if hub is None:
+            hub = NotificationHub(app, app.config["NOTIFICATION_STREAM_POLL_SECONDS"])
+            app.extensions["notification_hub"] = hub
+    return hub
+
+
+def sse_event(item: dict) -> str:
+    return f"id: {item['id']}\nevent: notification\ndata: {dumps_json(item).decode()}\n\n"
+
+
+def sse_resync(last_id: int) -> str:
+    # Too much was missed to replay; the client reloads GET /api/notifications.
+    return f"id: {last_id}\nevent: resync\ndata: {{}}\n\n"
+
+
+def event_stream(
+    hub: NotificationHub,
+    user_id: int,
+    q: queue.Queue,
+    backlog: list[dict],
+    heartbeat: float,
+    max_seconds: float,
+    resync_id: int | None = None,
+):
+    """Yield SSE frames: the replayed backlog (or a `resync` event when the
+    gap was too large to replay) first, then live notifications."""
+    last_sent = 0
+    try:
+        yield "retry: 3000\n\n"
+        if resync_id is not None:
+            last_sent = resync_id
+            yield sse_resync(resync_id)
+        for item in backlog:
+            last_sent = item["id"]
+            yield sse_event(item)
+
+        deadline = time.monotonic() + max_seconds
+        while time.monotonic() < deadline:
+            try:
+                item = q.get(timeout=heartbeat)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            if item is None:
+                break
+            if item["id"] <= last_sent:
+                continue
+            last_sent = item["id"]
+            yield sse_event(item)
+    finally:
+        hub.unsubscribe(user_id, q)
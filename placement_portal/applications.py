@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import datetime
+
+from flask import Flask, current_app
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from werkzeug.exceptions import ServiceUnavailable
+
+from . import metrics
+from .extensions import db
+from .models import Application, Company, Drive, Student, adjust_drive_counts
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+_writer_lock = threading.Lock()
+
+
+def submit_application(
+    student_id: int, drive_id: int, idempotency_key: str | None = None
+) -> tuple[Application, bool]:
+    """Create the application for (student, drive), or return the existing one.
+
+    Returns `(application, created)` and leaves committing to the caller. With
+    APPLICATION_WRITE_COALESCING enabled the insert is handed to the shared
+    `ApplicationWriter` instead and is already committed on return; if it is
+    not done within APPLICATION_WRITE_TIMEOUT_SECONDS a 503 with `Retry-After`
+    is raised.
+    """
+    config = current_app.config
+    if not config["APPLICATION_WRITE_COALESCING"]:
+        return _upsert_application(student_id, drive_id, idempotency_key)
+
+    future = get_writer().submit(student_id, drive_id, idempotency_key)
+    try:
+        app_id, created = future.result(timeout=config["APPLICATION_WRITE_TIMEOUT_SECONDS"])
+    except FutureTimeoutError as exc:
+        metrics.incr("application_write_timeouts")
+        # Not picked up yet: withdraw it. Otherwise it may still commit, which
+        # is harmless since the insert is an idempotent upsert per (student, drive).
+        future.cancel()
+        raise ServiceUnavailable(
+            "The application could not be saved in time. Retrying is safe; "
+            "it will not be submitted twice.",
+            retry_after=config["DB_LOCK_RETRY_AFTER_SECONDS"],
+        ) from exc
+    return db.session.get(Application, app_id), created
+
+
+def _upsert_application(
+    student_id: int, drive_id: int, idempotency_key: str | None = None
+) -> tuple[Application, bool]:
+    """Insert-or-fetch the application row in the current session.
+
+    On SQLite/PostgreSQL this is a single
+    `INSERT ... ON CONFLICT (student_id, drive_id) DO UPDATE ... RETURNING`
+    statement, so double submits never surface `uq_app_student_drive` errors and
+    the existing row comes back without a second query. The conflict branch
+    only rewrites `student_id` with its own value, i.e. it changes nothing.
+    A newly inserted row is added to the drive's counters in the same
+    transaction.
+
+    Raises ValueError if `idempotency_key` was already used by this student
+    for a different drive.
+    """
+    submitted_at = datetime.utcnow()
+    values = {
+        "student_id": student_id,
+        "drive_id": drive_id,
+        "status": "applied",
+        "application_date": submitted_at,
+        "updated_at": submitted_at,
+        "idempotency_key": idempotency_key,
+        **_display_field_values(student_id, drive_id),
+    }
+
+    insert = _UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
+    if insert is None:
+        return _submit_without_upsert(values)
+
+    stmt = insert(Application).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["student_id", "drive_id"],
+        set_={"student_id": stmt.excluded.student_id},
+    ).returning(Application)
+
+    try:
+        # A savepoint, so a failed insert leaves the caller's transaction intact.
+        with db.session.begin_nested():
+            app = db.session.scalars(stmt, execution_options={"populate_existing": True}).one()
+    except IntegrityError as exc:
+        if not _is_idempotency_conflict(exc):
+            raise
+        raise ValueError("Idempotency-Key was already used for a different drive.") from exc
+
+    # The row we inserted carries our own timestamp; an existing row does not.
+    created = app.application_date == submitted_at
+    if created:
+        # Bulk INSERT statements skip the mapper events that keep these counters.
+        adjust_drive_counts(db.session.connection(), drive_id, None, app.status)
+    return app, created
+
+
+def _display_field_values(student_id: int, drive_id: int) -> dict:
+    """Scalar subqueries filling the denormalized columns inside the INSERT itself."""
+    student = select(Student).where(Student.user_id == student_id)
+    drive = select(Drive).where(Drive.id == drive_id)
+    return {
+        "student_name": student.with_only_columns(Student.full_name).scalar_subquery(),
+        "student_uid": student.with_only_columns(Student.student_uid).scalar_subquery(),
+        "job_title": drive.with_only_columns(Drive.job_title).scalar_subquery(),
+        "company_id": drive.with_only_columns(Drive.company_id).scalar_subquery(),
+        "company_name": select(Company.company_name)
+        .join(Drive, Drive.company_id == Company.user_id)
+        .where(Drive.id == drive_id)
+        .scalar_subquery(),
+    }
+
+
+def _submit_without_upsert(values: dict) -> tuple[Application, bool]:
+    existing = Application.query.filter_by(
+        student_id=values["student_id"], drive_id=values["drive_id"]
+    ).first()
+    if existing is not None:
+        return existing, False
+
+    app = Application(**values)
+    try:
+        with db.session.begin_nested():
+            db.session.add(app)
+    except IntegrityError as exc:
+        existing = Application.query.filter_by(
+            student_id=values["student_id"], drive_id=values["drive_id"]
+        ).first()
+        if existing is None:
+            if not _is_idempotency_conflict(exc):
+                raise
+            raise ValueError("Idempotency-Key was already used for a different drive.") from exc
+        return existing, False
+    return app, True
+
+
+def _is_idempotency_conflict(exc: IntegrityError) -> bool:
+    """True when `exc` is a `uq_app_student_idempotency_key` violation."""
+    # PostgreSQL drivers name the constraint; SQLite only lists its columns.
+    diag = getattr(exc.orig, "diag", None)
+    constraint = getattr(diag, "constraint_name", None)
+    if constraint is not None:
+        return constraint == "uq_app_student_idempotency_key"
+    message = str(exc.orig)
+    return "uq_app_student_idempotency_key" in message or (
+        "applications.idempotency_key" in message
+    )
+
+
+class ApplicationWriter:
+    """Single writer thread that group-commits application inserts.
+
+    Under a deadline rush every request would otherwise take SQLite's write
+    lock for its own commit. Requests instead enqueue their insert and wait on
+    a Future; the writer drains up to `max_batch` items (waiting at most
+    `max_wait` seconds after the first) and commits them together. If the
+    group fails, its items are retried one by one so a single bad insert only
+    fails its own request.
+    """
+
+    def __init__(self, app: Flask, max_batch: int, max_wait: float):
+        self._app = app
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="application-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, student_id: int, drive_id: int, idempotency_key: str | None) -> Future:
+        future: Future = Future()
+        self._queue.put(((student_id, drive_id, idempotency_key), future))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._max_wait
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            # Drop items whose request gave up waiting (Future.cancel()); the
+            # rest can no longer be cancelled from here on.
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            with self._app.app_context():
+                self._commit(batch)
+
+    def _commit(self, batch: list) -> None:
+        try:
+            results = [_upsert_application(*args) for args, _ in batch]
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            for args, future in batch:
+                self._commit_one(args, future)
+            return
+
+        for (_, future), (app, created) in zip(batch, results):
+            future.set_result((app.id, created))
+
+    def _commit_one(self, args: tuple, future: Future) -> None:
+        try:
+            app, created = _upsert_application(*args)
+            db.session.commit()
+        except Exception as exc:
+            db.session.rollback()
+            future.set_exception(exc)
+        else:
+            future.set_result((app.id, created))
+
+
+def get_writer() -> ApplicationWriter:
+    app = current_app._get_current_object()
+    with _writer_lock:
+        writer = app.extensions.get("application_writer")
+        if writer is None:
+            writer = ApplicationWriter(
+                app,
+                max_batch=app.config["APPLICATION_WRITE_BATCH_SIZE"],
+                max_wait=app.config["APPLICATION_WRITE_MAX_WAIT_MS"] / 1000,
+            )
+            app.extensions["application_writer"] = writer
+    return writer
@@ -9,6 +9,9 @@ from werkzeug.utils import secure_filename
 
 from ..extensions import db
 from ..models import Company, Student, User
+from ..passwords import rehash_if_outdated
+from ..ratelimit import login_retry_after
+from ..transactions import run_with_lock_retry, write_transaction
 from .forms import CompanyRegistrationForm, LoginForm, StudentRegistrationForm
 
 bp = Blueprint("auth", __name__)
@@ -49,6 +52,15 @@ def login():
     form = LoginForm()
     if form.validate_on_submit():
         email = form.email.data.strip().lower()
+        retry_after = login_retry_after(email)
+        if retry_after:
+            flash(f"Too many login attempts. Try again in {retry_after} seconds.", "danger")
+            return (
+                render_template("auth/login.html", form=form),
+                429,
+                {"Retry-After": str(retry_after)},
+            )
+
         user = User.query.filter_by(email=email).first()
 
         if user is None or not user.check_password(form.password.data):
@@ -80,6 +92,7 @@ def login():
                 flash("Student account is blacklisted.", "danger")
                 return redirect(url_for("auth.login"))
 
+        rehash_if_outdated(user, form.password.data)
         login_user(user)
         return redirect(_dashboard_url_for(user))
 
@@ -94,8 +107,15 @@ def logout():
     return redirect(url_for("main.index"))
 
 
+def _discard_resume(rel_path: str | None) -> None:
+    if rel_path:
+        (Path(current_app.instance_path) / rel_path).unlink(missing_ok=True)
+
+
 @bp.route("/register/student", methods=["GET", "POST"])
 def register_student():
+    # Not @write_transaction: a lock retry would re-run the upload below, whose
+    # stream is already consumed. The file is saved once; only the DB writes retry.
     if current_user.is_authenticated:
         return redirect(_dashboard_url_for(current_user))
 
@@ -110,11 +130,6 @@ def register_student():
             flash("Student ID already registered.", "warning")
             return redirect(url_for("auth.register_student"))
 
-        user = User(email=email, role="student")
-        user.set_password(form.password.data)
-        db.session.add(user)
-        db.session.flush()  # assign user.id without committing
-
         resume_rel_path = None
         if form.resume.data:
             try:
@@ -123,20 +138,11 @@ def register_student():
                 flash(str(e), "danger")
                 return redirect(url_for("auth.register_student"))
 
-        student = Student(
-            user_id=user.id,
-            student_uid=form.student_uid.data.strip(),
-            full_name=form.full_name.data.strip(),
-            degree=(form.degree.data or "").strip() or None,
-            department=(form.department.data or "").strip() or None,
-            graduation_year=form.graduation_year.data,
-            cgpa=float(form.cgpa.data) if form.cgpa.data is not None else None,
-            phone=(form.phone.data or "").strip() or None,
-            skills=(form.skills.data or "").strip() or None,
-            resume_path=resume_rel_path,
-        )
-        db.session.add(student)
-        db.session.commit()
+        try:
+            user = run_with_lock_retry(_create_student_account, form, email, resume_rel_path)
+        except Exception:
+            _discard_resume(resume_rel_path)
+            raise
 
         login_user(user)
         flash("Student account created.", "success")
@@ -145,7 +151,31 @@ def register_student():
     return render_template("auth/register_student.html", form=form)
 
 
+def _create_student_account(form: StudentRegistrationForm, email: str, resume_rel_path: str | None) -> User:
+    user = User(email=email, role="student")
+    user.set_password(form.password.data)
+    db.session.add(user)
+    db.session.flush()  # assign user.id without committing
+
+    student = Student(
+        user_id=user.id,
+        student_uid=form.student_uid.data.strip(),
+        full_name=form.full_name.data.strip(),
+        degree=(form.degree.data or "").strip() or None,
+        department=(form.department.data or "").strip() or None,
+        graduation_year=form.graduation_year.data,
+        cgpa=float(form.cgpa.data) if form.cgpa.data is not None else None,
+        phone=(form.phone.data or "").strip() or None,
+        skills=(form.skills.data or "").strip() or None,
+        resume_path=resume_rel_path,
+    )
+    db.session.add(student)
+    db.session.commit()
+    return user
+
+
 @bp.route("/register/company", methods=["GET", "POST"])
+@write_transaction
 def register_company():
     if current_user.is_authenticated:
         return redirect(_dashboard_url_for(current_user))
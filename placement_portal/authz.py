@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from flask import Flask, session
+from flask_login import user_logged_in, user_logged_out
+
+from .models import User
+
+SESSION_KEY = "authz"
+
+
+def build_snapshot(user: User) -> dict:
+    """Small, signed-session copy of the flags the blueprint guards check."""
+    snapshot = {
+        "uid": user.id,
+        "role": user.role,
+        "v": user.auth_version,
+        "is_active": bool(user.is_active),
+        "is_blacklisted": False,
+        "approval_status": None,
+        "ok": bool(user.is_active),
+    }
+    if user.role == "student":
+        student = user.student_profile
+        snapshot["is_blacklisted"] = bool(student and student.is_blacklisted)
+        snapshot["ok"] = snapshot["ok"] and student is not None and not student.is_blacklisted
+    elif user.role == "company":
+        company = user.company_profile
+        snapshot["is_blacklisted"] = bool(company and company.is_blacklisted)
+        snapshot["approval_status"] = company.approval_status if company else None
+        snapshot["ok"] = (
+            snapshot["ok"]
+            and company is not None
+            and not company.is_blacklisted
+            and company.approval_status == "approved"
+        )
+    return snapshot
+
+
+def session_access_ok(user: User) -> bool:
+    """Whether `user` may still use its role's pages.
+
+    The snapshot stored at login is trusted while its `v` matches
+    `users.auth_version`, which is on the row Flask-Login already loaded, so
+    the common case needs no profile query. Admin actions that change access
+    bump the version (see models), forcing a rebuild on the next request.
+    """
+    snapshot = session.get(SESSION_KEY)
+    if not snapshot or snapshot.get("uid") != user.id or snapshot.get("v") != user.auth_version:
+        snapshot = build_snapshot(user)
+        session[SESSION_KEY] = snapshot
+    return snapshot["ok"]
+
+
+def _store_snapshot(sender, user: User, **extra) -> None:
+    session[SESSION_KEY] = build_snapshot(user)
+
+
+def _clear_snapshot(sender, user, **extra) -> None:
+    session.pop(SESSION_KEY, None)
+
+
+def init_authz(app: Flask) -> None:
+    user_logged_in.connect(_store_snapshot, app)
+    user_logged_out.connect(_clear_snapshot, app)
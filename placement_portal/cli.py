@@ -1,8 +1,20 @@
+from datetime import datetime, timedelta
+
 import click
 from flask import current_app
+from sqlalchemy import delete, insert, literal, select
 
 from .extensions import db
-from .models import Admin, User
+from .models import Admin, Notification, NotificationArchive, User
+from .passwords import hash_method, measure_check_rate, normalize_method
+from .resync import (
+    recompute_drive_visibility,
+    recount_drive_applicants,
+    recount_unread_notifications,
+    resync_all_application_names,
+)
+from .scheduler import close_expired_drives
+from .trigrams import rebuild_student_trigrams
 
 
 @click.command("init-db")
@@ -34,3 +46,131 @@ def init_db_command() -> None:
         click.echo("Admin user already seeded.")
 
     click.echo("Database initialized.")
+
+
+@click.command("compact-notifications")
+@click.option("--older-than-days", type=int, default=None, help="Defaults to NOTIFICATION_RETENTION_DAYS.")
+@click.option("--batch-size", type=int, default=None, help="Defaults to NOTIFICATION_COMPACT_BATCH_SIZE.")
+def compact_notifications_command(older_than_days: int | None, batch_size: int | None) -> None:
+    """Move old read notifications into the archive table, one batch per transaction."""
+    days = older_than_days if older_than_days is not None else current_app.config["NOTIFICATION_RETENTION_DAYS"]
+    batch_size = batch_size or current_app.config["NOTIFICATION_COMPACT_BATCH_SIZE"]
+    now = datetime.utcnow()
+    cutoff = now - timedelta(days=days)
+
+    total = 0
+    while True:
+        ids = db.session.scalars(
+            select(Notification.id)
+            .where(Notification.is_read.is_(True), Notification.created_at < cutoff)
+            .order_by(Notification.id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            break
+
+        db.session.execute(
+            insert(NotificationArchive).from_select(
+                ["id", "user_id", "message", "created_at", "archived_at"],
+                select(
+                    Notification.id,
+                    Notification.user_id,
+                    Notification.message,
+                    Notification.created_at,
+                    literal(now),
+                ).where(Notification.id.in_(ids)),
+            )
+        )
+        db.session.execute(delete(Notification).where(Notification.id.in_(ids)))
+        db.session.commit()
+        total += len(ids)
+
+    click.echo(f"Archived {total} notification(s) read and older than {days} day(s).")
+
+
+@click.command("close-expired-drives")
+@click.option("--batch-size", type=int, default=None, help="Defaults to DRIVE_AUTO_CLOSE_BATCH_SIZE.")
+def close_expired_drives_command(batch_size: int | None) -> None:
+    """Close pending/approved drives whose application deadline has passed."""
+    closed = close_expired_drives(batch_size or current_app.config["DRIVE_AUTO_CLOSE_BATCH_SIZE"])
+    click.echo(f"Closed {closed} expired drive(s).")
+
+
+@click.command("resync-application-names")
+@click.option("--batch-size", type=int, default=None, help="Defaults to APPLICATION_RESYNC_BATCH_SIZE.")
+def resync_application_names_command(batch_size: int | None) -> None:
+    """Recompute the student/drive/company names denormalized onto applications."""
+    updated = resync_all_application_names(
+        batch_size or current_app.config["APPLICATION_RESYNC_BATCH_SIZE"]
+    )
+    click.echo(f"Resynced {updated} application(s).")
+
+
+@click.command("recount-drive-applicants")
+@click.option("--batch-size", type=int, default=None, help="Defaults to DRIVE_RECOUNT_BATCH_SIZE.")
+def recount_drive_applicants_command(batch_size: int | None) -> None:
+    """Recompute the applicant/status counters stored on drives."""
+    fixed = recount_drive_applicants(batch_size or current_app.config["DRIVE_RECOUNT_BATCH_SIZE"])
+    click.echo(f"Corrected counts on {fixed} drive(s).")
+
+
+@click.command("recompute-drive-visibility")
+@click.option("--batch-size", type=int, default=None, help="Defaults to DRIVE_VISIBILITY_BATCH_SIZE.")
+def recompute_drive_visibility_command(batch_size: int | None) -> None:
+    """Recompute the visibility flag stored on drives."""
+    fixed = recompute_drive_visibility(batch_size or current_app.config["DRIVE_VISIBILITY_BATCH_SIZE"])
+    click.echo(f"Corrected visibility on {fixed} drive(s).")
+
+
+@click.command("recount-unread-notifications")
+@click.option("--batch-size", type=int, default=None, help="Defaults to NOTIFICATION_RECOUNT_BATCH_SIZE.")
+def recount_unread_notifications_command(batch_size: int | None) -> None:
+    """Recompute the unread notification counter stored on users."""
+    fixed = recount_unread_notifications(
+        batch_size or current_app.config["NOTIFICATION_RECOUNT_BATCH_SIZE"]
+    )
+    click.echo(f"Corrected unread counts on {fixed} user(s).")
+
+
+@click.command("rebuild-student-trigrams")
+@click.option("--batch-size", type=int, default=None, help="Defaults to STUDENT_TRIGRAM_BATCH_SIZE.")
+def rebuild_student_trigrams_command(batch_size: int | None) -> None:
+    """Recompute the fuzzy-search trigram index for every student."""
+    batch_size = batch_size or current_app.config["STUDENT_TRIGRAM_BATCH_SIZE"]
+    total = rebuild_student_trigrams(batch_size)
+    click.echo(f"Reindexed {total} student(s).")
+
+
+# Candidates timed by bench-password-hash when no --method is given.
+_BENCH_PASSWORD_METHODS = (
+    "pbkdf2:sha256:1000000",
+    "pbkdf2:sha256:600000",
+    "pbkdf2:sha256:310000",
+    "scrypt:32768:8:1",
+    "scrypt:16384:8:1",
+)
+
+
+@click.command("bench-password-hash")
+@click.option("--method", "methods", multiple=True, help="Werkzeug hash method to time; repeatable.")
+@click.option("--seconds", type=float, default=1.0, show_default=True, help="Time spent per method.")
+def bench_password_hash_command(methods: tuple[str, ...], seconds: float) -> None:
+    """Report password checks (= logins) per second per core for hash settings."""
+    current = hash_method()
+    try:
+        candidates = [normalize_method(m) for m in methods] or [current, *_BENCH_PASSWORD_METHODS]
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="--method") from exc
+    seen = set()
+    for method in candidates:
+        if method in seen:
+            continue
+        seen.add(method)
+        try:
+            rate, count = measure_check_rate(method, seconds)
+        except (ValueError, AttributeError) as exc:
+            # e.g. hashlib.scrypt missing from this Python build.
+            click.echo(f"{method:<24} unavailable: {exc}")
+            continue
+        marker = "  (PASSWORD_HASH_METHOD)" if method == current else ""
+        click.echo(f"{method:<24} {1000 / rate:8.1f} ms/login {rate:8.1f} logins/s/core  [{count} runs]{marker}")
@@ -2,13 +2,16 @@ from __future__ import annotations
 
 from datetime import date, datetime, timedelta
 
-from flask import Blueprint, abort, flash, redirect, render_template, request, url_for
+from flask import Blueprint, abort, current_app, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required, logout_user
 from sqlalchemy import func
 
+from ..authz import session_access_ok
 from ..decorators import roles_required
 from ..extensions import db
 from ..models import Application, Drive, Notification, Placement
+from ..ranking import SORTS, applicant_page
+from ..transactions import write_transaction
 from .forms import DriveForm
 
 bp = Blueprint("company", __name__)
@@ -21,13 +24,7 @@ def _company_guard():
     if current_user.role != "company":
         abort(403)
 
-    company = current_user.company_profile
-    if (
-        company is None
-        or not current_user.is_active
-        or company.is_blacklisted
-        or company.approval_status != "approved"
-    ):
+    if not session_access_ok(current_user):
         logout_user()
         flash("Company access revoked. Contact the placement cell.", "danger")
         return redirect(url_for("auth.login"))
@@ -37,25 +34,12 @@ def _company_guard():
 @login_required
 @roles_required("company")
 def dashboard():
-    company = current_user.company_profile
-
     drives = (
-        Drive.query.filter_by(company_id=company.user_id, is_deleted=False)
+        Drive.query.filter_by(company_id=current_user.id, is_deleted=False)
         .order_by(Drive.created_at.desc())
         .all()
     )
 
-    drive_ids = [d.id for d in drives]
-    counts = {}
-    if drive_ids:
-        rows = (
-            db.session.query(Application.drive_id, func.count(Application.id))
-            .filter(Application.drive_id.in_(drive_ids))
-            .group_by(Application.drive_id)
-            .all()
-        )
-        counts = {drive_id: count for drive_id, count in rows}
-
     # Trend: applications per day (last 30 days) across all drives of this company.
     start_day = date.today() - timedelta(days=29)
     start_dt = datetime.combine(start_day, datetime.min.time())
@@ -63,7 +47,7 @@ def dashboard():
     trend_rows = (
         db.session.query(func.date(Application.application_date), func.count(Application.id))
         .join(Drive, Application.drive_id == Drive.id)
-        .filter(Drive.company_id == company.user_id, Application.application_date >= start_dt)
+        .filter(Drive.company_id == current_user.id, Application.application_date >= start_dt)
         .group_by(func.date(Application.application_date))
         .all()
     )
@@ -74,7 +58,6 @@ def dashboard():
     return render_template(
         "company/dashboard.html",
         drives=drives,
-        applicant_counts=counts,
         trend_labels=trend_labels,
         trend_values=trend_values,
     )
@@ -83,13 +66,12 @@ def dashboard():
 @bp.route("/drives/new", methods=["GET", "POST"])
 @login_required
 @roles_required("company")
+@write_transaction
 def create_drive():
-    company = current_user.company_profile
-
     form = DriveForm()
     if form.validate_on_submit():
         drive = Drive(
-            company_id=company.user_id,
+            company_id=current_user.id,
             job_title=form.job_title.data.strip(),
             job_description=form.job_description.data.strip(),
             eligibility_criteria=(form.eligibility_criteria.data or "").strip() or None,
@@ -113,11 +95,10 @@ def create_drive():
 @bp.route("/drives/<int:drive_id>/edit", methods=["GET", "POST"])
 @login_required
 @roles_required("company")
+@write_transaction
 def edit_drive(drive_id: int):
-    company = current_user.company_profile
-
     drive = Drive.query.get_or_404(drive_id)
-    if drive.company_id != company.user_id or drive.is_deleted:
+    if drive.company_id != current_user.id or drive.is_deleted:
         flash("Not allowed.", "danger")
         return redirect(url_for("company.dashboard"))
 
@@ -148,11 +129,10 @@ def edit_drive(drive_id: int):
 @bp.post("/drives/<int:drive_id>/close")
 @login_required
 @roles_required("company")
+@write_transaction
 def close_drive(drive_id: int):
-    company = current_user.company_profile
-
     drive = Drive.query.get_or_404(drive_id)
-    if drive.company_id != company.user_id or drive.is_deleted:
+    if drive.company_id != current_user.id or drive.is_deleted:
         flash("Not allowed.", "danger")
         return redirect(url_for("company.dashboard"))
 
@@ -165,11 +145,10 @@ def close_drive(drive_id: int):
 @bp.post("/drives/<int:drive_id>/delete")
 @login_required
 @roles_required("company")
+@write_transaction
 def delete_drive(drive_id: int):
-    company = current_user.company_profile
-
     drive = Drive.query.get_or_404(drive_id)
-    if drive.company_id != company.user_id or drive.is_deleted:
+    if drive.company_id != current_user.id or drive.is_deleted:
         flash("Not allowed.", "danger")
         return redirect(url_for("company.dashboard"))
 
@@ -183,31 +162,35 @@ def delete_drive(drive_id: int):
 @login_required
 @roles_required("company")
 def drive_applications(drive_id: int):
-    company = current_user.company_profile
-
     drive = Drive.query.get_or_404(drive_id)
-    if drive.company_id != company.user_id or drive.is_deleted:
+    if drive.company_id != current_user.id or drive.is_deleted:
         flash("Not allowed.", "danger")
         return redirect(url_for("company.dashboard"))
 
-    applications = (
-        Application.query.filter_by(drive_id=drive.id)
-        .order_by(Application.application_date.desc())
-        .all()
-    )
+    sort = request.args.get("sort", "date")
+    if sort not in SORTS:
+        sort = "date"
+    page = max(request.args.get("page", type=int) or 1, 1)
+    per_page = current_app.config["APPLICANTS_PER_PAGE"]
+    applicants, total = applicant_page(drive, sort, page, per_page)
     return render_template(
-        "company/drive_applications.html", drive=drive, applications=applications
+        "company/drive_applications.html",
+        drive=drive,
+        applicants=applicants,
+        sort=sort,
+        page=page,
+        pages=max((total + per_page - 1) // per_page, 1),
+        total=total,
     )
 
 
 @bp.post("/applications/<int:application_id>/set-status")
 @login_required
 @roles_required("company")
+@write_transaction
 def set_application_status(application_id: int):
-    company = current_user.company_profile
-
     app = Application.query.get_or_404(application_id)
-    if app.drive.company_id != company.user_id:
+    if app.drive.company_id != current_user.id:
         flash("Not allowed.", "danger")
         return redirect(url_for("company.dashboard"))
 
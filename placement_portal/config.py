@@ -23,6 +23,110 @@ class Config:
     UPLOAD_FOLDER = os.environ.get("UPLOAD_FOLDER", str(INSTANCE_DIR / "uploads"))
     MAX_CONTENT_LENGTH = int(os.environ.get("MAX_CONTENT_LENGTH", 5 * 1024 * 1024))
 
+    # POST /api/batch: upper bound on sub-requests per call.
+    API_BATCH_MAX_REQUESTS = int(os.environ.get("API_BATCH_MAX_REQUESTS", 20))
+
+    # List endpoints stream their JSON body past this many rows (or with ?stream=1),
+    # fetching API_STREAM_BATCH_SIZE rows per round trip.
+    API_STREAM_THRESHOLD = int(os.environ.get("API_STREAM_THRESHOLD", 1000))
+    API_STREAM_BATCH_SIZE = int(os.environ.get("API_STREAM_BATCH_SIZE", 500))
+
+    # Ranked applicant listing (company drive page, GET /api/drives/<id>/applicants).
+    APPLICANTS_PER_PAGE = int(os.environ.get("APPLICANTS_PER_PAGE", 25))
+
+    # POST /api/admin/moderation: upper bound on ids per call.
+    MODERATION_MAX_IDS = int(os.environ.get("MODERATION_MAX_IDS", 1000))
+
+    # GET /api/notifications/stream (Server-Sent Events)
+    NOTIFICATION_STREAM_POLL_SECONDS = float(os.environ.get("NOTIFICATION_STREAM_POLL_SECONDS", 2))
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS = float(
+        os.environ.get("NOTIFICATION_STREAM_HEARTBEAT_SECONDS", 15)
+    )
+    # Streams are closed after this long so workers get recycled; clients reconnect.
+    NOTIFICATION_STREAM_MAX_SECONDS = float(os.environ.get("NOTIFICATION_STREAM_MAX_SECONDS", 300))
+    # Missed notifications replayed on reconnect; beyond this a `resync` event is sent.
+    NOTIFICATION_STREAM_REPLAY_LIMIT = int(os.environ.get("NOTIFICATION_STREAM_REPLAY_LIMIT", 100))
+
+    # `flask compact-notifications`: read notifications older than this are archived.
+    NOTIFICATION_RETENTION_DAYS = int(os.environ.get("NOTIFICATION_RETENTION_DAYS", 90))
+    NOTIFICATION_COMPACT_BATCH_SIZE = int(os.environ.get("NOTIFICATION_COMPACT_BATCH_SIZE", 1000))
+    # Users per transaction for `flask recount-unread-notifications`.
+    NOTIFICATION_RECOUNT_BATCH_SIZE = int(os.environ.get("NOTIFICATION_RECOUNT_BATCH_SIZE", 1000))
+
+    # Optional group commit for application submissions (see ApplicationWriter).
+    APPLICATION_WRITE_COALESCING = os.environ.get("APPLICATION_WRITE_COALESCING", "0") == "1"
+    APPLICATION_WRITE_BATCH_SIZE = int(os.environ.get("APPLICATION_WRITE_BATCH_SIZE", 50))
+    APPLICATION_WRITE_MAX_WAIT_MS = float(os.environ.get("APPLICATION_WRITE_MAX_WAIT_MS", 5))
+    APPLICATION_WRITE_TIMEOUT_SECONDS = float(os.environ.get("APPLICATION_WRITE_TIMEOUT_SECONDS", 10))
+
+    # Write routes retry `database is locked` with jittered exponential backoff,
+    # then answer 503 + Retry-After.
+    DB_LOCK_RETRY_ATTEMPTS = int(os.environ.get("DB_LOCK_RETRY_ATTEMPTS", 4))
+    DB_LOCK_RETRY_BASE_SECONDS = float(os.environ.get("DB_LOCK_RETRY_BASE_SECONDS", 0.05))
+    DB_LOCK_RETRY_MAX_SECONDS = float(os.environ.get("DB_LOCK_RETRY_MAX_SECONDS", 1.0))
+    DB_LOCK_RETRY_AFTER_SECONDS = int(os.environ.get("DB_LOCK_RETRY_AFTER_SECONDS", 2))
+
+    # In-process job closing drives whose deadline has passed (shortly after midnight).
+    DRIVE_AUTO_CLOSE_ENABLED = os.environ.get("DRIVE_AUTO_CLOSE_ENABLED", "1") == "1"
+    DRIVE_AUTO_CLOSE_DELAY_SECONDS = int(os.environ.get("DRIVE_AUTO_CLOSE_DELAY_SECONDS", 60))
+    DRIVE_AUTO_CLOSE_BATCH_SIZE = int(os.environ.get("DRIVE_AUTO_CLOSE_BATCH_SIZE", 500))
+
+    # Rows per transaction when copying renamed names onto applications.
+    APPLICATION_RESYNC_BATCH_SIZE = int(os.environ.get("APPLICATION_RESYNC_BATCH_SIZE", 500))
+
+    # Drives per transaction for `flask recount-drive-applicants`.
+    DRIVE_RECOUNT_BATCH_SIZE = int(os.environ.get("DRIVE_RECOUNT_BATCH_SIZE", 500))
+
+    # Drives per transaction for `flask recompute-drive-visibility`.
+    DRIVE_VISIBILITY_BATCH_SIZE = int(os.environ.get("DRIVE_VISIBILITY_BATCH_SIZE", 500))
+
+    # Admin search results (primary keys) cached per worker; writes invalidate them.
+    SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES", 256))
+    SEARCH_CACHE_TTL_SECONDS = int(os.environ.get("SEARCH_CACHE_TTL_SECONDS", 60))
+
+    # GET /api/suggest: in-memory prefix index, fully rebuilt at least this often.
+    SUGGEST_LIMIT = int(os.environ.get("SUGGEST_LIMIT", 10))
+    SUGGEST_REBUILD_SECONDS = int(os.environ.get("SUGGEST_REBUILD_SECONDS", 300))
+
+    # Fuzzy student search: minimum share of the query's trigrams a student must have.
+    STUDENT_FUZZY_MIN_SIMILARITY = float(os.environ.get("STUDENT_FUZZY_MIN_SIMILARITY", 0.5))
+    STUDENT_TRIGRAM_BATCH_SIZE = int(os.environ.get("STUDENT_TRIGRAM_BATCH_SIZE", 500))
+
+    # Werkzeug hash method for passwords, with its cost ("pbkdf2:sha256:600000",
+    # "scrypt:16384:8:1"). Werkzeug >=3 defaults to scrypt, but some Python builds
+    # (notably the system Python on certain macOS setups) lack hashlib.scrypt, so
+    # PBKDF2 stays the default. Older hashes are upgraded on the next login;
+    # compare candidates with `flask bench-password-hash`.
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "pbkdf2:sha256")
+
+    # GET /api/health/ready answers 503 past any of these limits.
+    HEALTH_DB_LATENCY_MAX_MS = float(os.environ.get("HEALTH_DB_LATENCY_MAX_MS", 250))
+    HEALTH_WRITE_LOCK_TIMEOUT_SECONDS = float(os.environ.get("HEALTH_WRITE_LOCK_TIMEOUT_SECONDS", 1.0))
+    HEALTH_WAL_MAX_BYTES = int(os.environ.get("HEALTH_WAL_MAX_BYTES", 64 * 1024 * 1024))
+    HEALTH_MIN_FREE_BYTES = int(os.environ.get("HEALTH_MIN_FREE_BYTES", 200 * 1024 * 1024))
+
+    # Login throttling (auth.login, POST /api/session): token buckets per client IP
+    # and per email, checked before the password hash. "memory" keeps them per
+    # worker; "sqlite" shares them between the workers of one host.
+    LOGIN_RATE_LIMIT_ENABLED = os.environ.get("LOGIN_RATE_LIMIT_ENABLED", "1") == "1"
+    LOGIN_RATE_LIMIT_STORAGE = os.environ.get("LOGIN_RATE_LIMIT_STORAGE", "memory")
+    LOGIN_RATE_LIMIT_SQLITE_PATH = os.environ.get(
+        "LOGIN_RATE_LIMIT_SQLITE_PATH", str(INSTANCE_DIR / "ratelimit.sqlite3")
+    )
+    LOGIN_RATE_LIMIT_MAX_KEYS = int(os.environ.get("LOGIN_RATE_LIMIT_MAX_KEYS", 10000))
+    LOGIN_RATE_LIMIT_IP_BURST = int(os.environ.get("LOGIN_RATE_LIMIT_IP_BURST", 20))
+    LOGIN_RATE_LIMIT_IP_PER_MINUTE = float(os.environ.get("LOGIN_RATE_LIMIT_IP_PER_MINUTE", 10))
+    LOGIN_RATE_LIMIT_EMAIL_BURST = int(os.environ.get("LOGIN_RATE_LIMIT_EMAIL_BURST", 5))
+    LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE = float(os.environ.get("LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE", 2))
+
+    # Opt-in request profiler: dumps .pstats files to instance/profiles.
+    PROFILER_ENABLED = os.environ.get("PROFILER_ENABLED", "0") == "1"
+    PROFILER_SAMPLE_RATE = float(os.environ.get("PROFILER_SAMPLE_RATE", 0))
+    PROFILER_HEADER = os.environ.get("PROFILER_HEADER", "X-Profile-Token")
+    PROFILER_TOKEN_MAX_AGE = int(os.environ.get("PROFILER_TOKEN_MAX_AGE", 24 * 3600))
+    PROFILER_MAX_FILES = int(os.environ.get("PROFILER_MAX_FILES", 50))
+    PROFILER_MAX_BYTES = int(os.environ.get("PROFILER_MAX_BYTES", 50 * 1024 * 1024))
+
     # Session cookie hardening (keep HTTPS optional for local demos).
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = os.environ.get("SESSION_COOKIE_SAMESITE", "Lax")
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import zipfile
 from pathlib import Path
 
-from flask import Blueprint, abort, current_app, send_file
+from flask import Blueprint, Response, abort, current_app, send_file
 from flask_login import current_user, login_required
+from sqlalchemy import select
 
 from ..extensions import db
 from ..models import Application, Drive, Student
 
 bp = Blueprint("files", __name__)
 
+# Read size for files copied into a streamed archive.
+_ZIP_CHUNK_SIZE = 64 * 1024
+
 
 @bp.get("/resumes/<int:student_id>")
 @login_required
@@ -51,3 +56,78 @@ def student_resume(student_id: int):
         download_name=f"{student.student_uid}_resume.pdf",
     )
 
+
+class _ZipBuffer:
+    """Write-only, unseekable sink for `zipfile`; `drain()` hands back what was
+    written since the last call. Without `seek`/`tell`, zipfile writes each
+    entry's sizes in a trailing data descriptor, so nothing is ever rewritten."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _stream_zip(entries: list[tuple[str, Path]]):
+    buffer = _ZipBuffer()
+    # PDFs are already compressed; store them as-is.
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for arcname, path in entries:
+            try:
+                info = zipfile.ZipInfo.from_file(path, arcname)
+                with path.open("rb") as src, archive.open(info, "w") as dst:
+                    while chunk := src.read(_ZIP_CHUNK_SIZE):
+                        dst.write(chunk)
+                        yield buffer.drain()
+            except FileNotFoundError:
+                # Removed since the listing was built; leave it out.
+                continue
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+@bp.get("/drives/<int:drive_id>/resumes.zip")
+@login_required
+def drive_resumes_zip(drive_id: int):
+    """All resumes uploaded by a drive's applicants as one streamed ZIP.
+
+    Access is checked once for the drive (admin or the owning company) rather
+    than per student as in `student_resume`.
+    """
+    drive = Drive.query.get_or_404(drive_id)
+    if drive.is_deleted:
+        abort(404)
+    if not (
+        current_user.role == "admin"
+        or (current_user.role == "company" and drive.company_id == current_user.id)
+    ):
+        abort(403)
+
+    rows = db.session.execute(
+        select(Student.student_uid, Student.resume_path)
+        .join(Application, Application.student_id == Student.user_id)
+        .where(Application.drive_id == drive.id, Student.resume_path.isnot(None))
+        .order_by(Student.student_uid)
+    )
+    instance_path = Path(current_app.instance_path)
+    entries = [
+        (f"{student_uid}_resume.pdf", instance_path / resume_path)
+        for student_uid, resume_path in rows
+    ]
+
+    # The listing is fully read above, so the generator never touches the DB.
+    return Response(
+        _stream_zip(entries),
+        mimetype="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="drive-{drive.id}-resumes.zip"'},
+    )
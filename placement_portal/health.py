@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+
+from flask import current_app
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from .extensions import db
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def _sqlite_path() -> str | None:
+    """Path of the SQLite database file, or None for other backends / :memory:."""
+    url = db.engine.url
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return url.database
+
+
+def check_database() -> dict:
+    config = current_app.config
+    start = time.perf_counter()
+    try:
+        db.session.execute(text("SELECT 1"))
+    except SQLAlchemyError as exc:
+        db.session.rollback()
+        return {"ok": False, "error": str(exc.__cause__ or exc)}
+    latency = time.perf_counter() - start
+    limit = config["HEALTH_DB_LATENCY_MAX_MS"]
+    return {"ok": _ms(latency) <= limit, "latency_ms": _ms(latency), "max_ms": limit}
+
+
+def check_write_lock(path: str) -> dict:
+    """Take SQLite's write lock (BEGIN IMMEDIATE) and release it straight away.
+
+    A separate connection with its own timeout keeps the probe from queuing
+    behind the pool; failing within HEALTH_WRITE_LOCK_TIMEOUT_SECONDS means
+    writes on this worker would be stuck too.
+    """
+    timeout = current_app.config["HEALTH_WRITE_LOCK_TIMEOUT_SECONDS"]
+    start = time.perf_counter()
+    try:
+        conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("ROLLBACK")
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error as exc:
+        return {"ok": False, "error": str(exc), "waited_ms": _ms(time.perf_counter() - start)}
+    return {"ok": True, "wait_ms": _ms(time.perf_counter() - start), "journal_mode": journal_mode}
+
+
+def check_wal(path: str) -> dict:
+    # A WAL that keeps growing means checkpoints are starved by long readers.
+    limit = current_app.config["HEALTH_WAL_MAX_BYTES"]
+    try:
+        size = os.path.getsize(f"{path}-wal")
+    except FileNotFoundError:
+        size = 0
+    return {"ok": size <= limit, "bytes": size, "max_bytes": limit}
+
+
+def check_disk() -> dict:
+    limit = current_app.config["HEALTH_MIN_FREE_BYTES"]
+    # The upload folder is created on first upload; measure its nearest existing parent.
+    path = Path(current_app.config["UPLOAD_FOLDER"])
+    while not path.exists() and path != path.parent:
+        path = path.parent
+    try:
+        free = shutil.disk_usage(path).free
+    except OSError as exc:
+        return {"ok": False, "error": str(exc)}
+    return {"ok": free >= limit, "free_bytes": free, "min_free_bytes": limit}
+
+
+def readiness() -> tuple[bool, dict]:
+    """Run every readiness check; returns (all passed, per-check details)."""
+    checks = {"database": check_database()}
+    path = _sqlite_path()
+    if path is not None:
+        checks["write_lock"] = check_write_lock(path)
+        checks["wal"] = check_wal(path)
+    checks["upload_disk"] = check_disk()
+    return all(check["ok"] for check in checks.values()), checks
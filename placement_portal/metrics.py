@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+
+# Process-local counters (per worker), exposed to admins via GET /api/metrics.
+_lock = threading.Lock()
+_counters: Counter = Counter()
+
+
+def incr(name: str, amount: int = 1) -> None:
+    with _lock:
+        _counters[name] += amount
+
+
+def snapshot() -> dict[str, int]:
+    with _lock:
+        return dict(_counters)
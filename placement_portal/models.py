@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 from datetime import date, datetime
+from itertools import chain
 
 from flask_login import UserMixin
-from werkzeug.security import check_password_hash, generate_password_hash
+from sqlalchemy import and_, case, event, exists, false, inspect, or_, true, update
+from sqlalchemy.orm import Session
+from werkzeug.security import check_password_hash
 
 from .extensions import db, login_manager
+from .passwords import hash_password
+from .search_cache import bump_search_generations
 
 
 class User(UserMixin, db.Model):
@@ -21,16 +26,21 @@ class User(UserMixin, db.Model):
     is_active = db.Column(db.Boolean, nullable=False, default=True)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
+    # Maintained by the Notification mapper events below (navbar badge, API count).
+    unread_notification_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Bumped whenever access-relevant flags change; invalidates the session
+    # authorization snapshot (see authz.py).
+    auth_version = db.Column(db.Integer, nullable=False, default=1)
+
     admin_profile = db.relationship("Admin", back_populates="user", uselist=False)
     company_profile = db.relationship("Company", back_populates="user", uselist=False)
     student_profile = db.relationship("Student", back_populates="user", uselist=False)
     notifications = db.relationship("Notification", back_populates="user")
 
     def set_password(self, password: str) -> None:
-        # Werkzeug >=3 defaults to scrypt, but some Python builds (notably the
-        # system Python on certain macOS setups) may not have hashlib.scrypt.
-        # PBKDF2 is widely supported and sufficient for this course project.
-        self.password_hash = generate_password_hash(password, method="pbkdf2:sha256")
+        # Method and cost come from PASSWORD_HASH_METHOD (see config.py).
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
         return check_password_hash(self.password_hash, password)
@@ -126,14 +136,67 @@ class Drive(db.Model):
     )  # pending/approved/rejected/closed
     is_deleted = db.Column(db.Boolean, nullable=False, default=False, index=True)
 
+    # Denormalized "students can see and apply to this drive" flag, kept in sync
+    # by the flush listeners at the bottom of this module (see visibility_expr).
+    is_visible = db.Column(db.Boolean, nullable=False, default=False)
+
+    # Denormalized application counters, moved by `adjust_drive_counts` in the
+    # same transaction as the application write. `flask recount-drive-applicants`
+    # repairs drift.
+    applicant_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    shortlisted_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    selected_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rejected_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # Expired drives are closed by the scheduler, so listings filter on status alone.
+    __table_args__ = (
+        db.Index("ix_drives_status_created_at", "status", "created_at"),
+        db.Index("ix_drives_is_visible_created_at", "is_visible", "created_at"),
+    )
+
     company = db.relationship("Company", back_populates="drives")
     applications = db.relationship("Application", back_populates="drive")
 
+    def compute_visibility(self, company: Company | None) -> bool:
+        return bool(
+            company is not None
+            and company.approval_status == "approved"
+            and not company.is_blacklisted
+            and self.status == "approved"
+            and not self.is_deleted
+            and (self.application_deadline is None or self.application_deadline >= date.today())
+        )
+
+    @classmethod
+    def visibility_expr(cls, status: str | None = None):
+        """SQL equivalent of `compute_visibility`, for bulk UPDATEs of drives.
+
+        Pass `status` when the same UPDATE also sets it: SET expressions see
+        the row as it was before the statement.
+        """
+        drives = cls.__table__
+        companies = Company.__table__
+        company_ok = exists().where(
+            companies.c.user_id == drives.c.company_id,
+            companies.c.approval_status == "approved",
+            companies.c.is_blacklisted.is_(False),
+        )
+        if status is None:
+            status_ok = drives.c.status == "approved"
+        else:
+            status_ok = true() if status == "approved" else false()
+        return and_(
+            status_ok,
+            drives.c.is_deleted.is_(False),
+            or_(drives.c.application_deadline.is_(None), drives.c.application_deadline >= date.today()),
+            company_ok,
+        )
+
 
 class Application(db.Model):
     __tablename__ = "applications"
@@ -153,8 +216,20 @@ class Application(db.Model):
         db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # Client-supplied `Idempotency-Key` of the API request that created the row.
+    idempotency_key = db.Column(db.String(64), nullable=True)
+
+    # Display fields copied from the student/drive/company so listings need no
+    # joins. Renames are propagated by the flush/commit listeners below.
+    student_name = db.Column(db.String(200), nullable=True)
+    student_uid = db.Column(db.String(50), nullable=True)
+    job_title = db.Column(db.String(200), nullable=True)
+    company_id = db.Column(db.Integer, nullable=True, index=True)
+    company_name = db.Column(db.String(200), nullable=True)
+
     __table_args__ = (
         db.UniqueConstraint("student_id", "drive_id", name="uq_app_student_drive"),
+        db.UniqueConstraint("student_id", "idempotency_key", name="uq_app_student_idempotency_key"),
     )
 
     student = db.relationship("Student", back_populates="applications")
@@ -188,6 +263,281 @@ class Notification(db.Model):
 
     user = db.relationship("User", back_populates="notifications")
 
+    # Ids must never be reused: archived rows keep theirs, and SSE Last-Event-ID /
+    # before_id paging rely on them only growing. Plain SQLite rowids restart
+    # after the highest rows are moved out by `flask compact-notifications`.
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    @classmethod
+    def mark_all_read(cls, user_id: int) -> int:
+        """Mark every unread notification of a user as read; returns the row count."""
+        result = db.session.execute(
+            update(cls)
+            .where(cls.user_id == user_id, cls.is_read.is_(False))
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(
+            update(User).where(User.id == user_id).values(unread_notification_count=0)
+        )
+        return result.rowcount
+
+
+class NotificationArchive(db.Model):
+    """Read notifications moved out of `notifications` by `flask compact-notifications`.
+
+    Rows keep their original id; the only index is (user_id, id), which is all
+    the history pager needs.
+    """
+
+    __tablename__ = "notification_archive"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (db.Index("ix_notification_archive_user_id_id", "user_id", "id"),)
+
+
+class StudentTrigram(db.Model):
+    """Trigram index over student name, roll number, phone and email.
+
+    Maintained by the listeners in trigrams.py; rebuild with
+    `flask rebuild-student-trigrams`.
+    """
+
+    __tablename__ = "student_trigrams"
+
+    trigram = db.Column(db.String(3), primary_key=True)
+    student_id = db.Column(
+        db.Integer, db.ForeignKey("students.user_id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+
+
+def _adjust_unread(connection, user_id: int, delta: int) -> None:
+    users = User.__table__
+    count = users.c.unread_notification_count + delta
+    if delta < 0:
+        # Rows the counter never saw (e.g. from before it existed) must not
+        # drive it negative; `flask recount-unread-notifications` repairs drift.
+        count = case((count < 0, 0), else_=count)
+    connection.execute(
+        update(users).where(users.c.id == user_id).values(unread_notification_count=count)
+    )
+
+
+@event.listens_for(Notification, "after_insert")
+def _notification_inserted(mapper, connection, target: Notification) -> None:
+    if not target.is_read:
+        _adjust_unread(connection, target.user_id, 1)
+
+
+@event.listens_for(Notification, "after_update")
+def _notification_updated(mapper, connection, target: Notification) -> None:
+    history = inspect(target).attrs.is_read.history
+    if not history.has_changes():
+        return
+    was_read = bool(history.deleted[0]) if history.deleted else False
+    if was_read != bool(target.is_read):
+        _adjust_unread(connection, target.user_id, -1 if target.is_read else 1)
+
+
+@event.listens_for(Notification, "after_delete")
+def _notification_deleted(mapper, connection, target: Notification) -> None:
+    if not target.is_read:
+        _adjust_unread(connection, target.user_id, -1)
+
+
+# Application status -> Drive counter column; "applied" only counts in applicant_count.
+DRIVE_STATUS_COUNTERS = {
+    "shortlisted": "shortlisted_count",
+    "selected": "selected_count",
+    "rejected": "rejected_count",
+}
+
+
+def adjust_drive_counts(connection, drive_id: int, old_status: str | None, new_status: str | None) -> None:
+    """Move one application of `drive_id` from `old_status` to `new_status`.
+
+    None means "no application": (None, "applied") counts a new one and
+    (status, None) a removed one. The columns are updated relative to their
+    current value, so concurrent writers never lose an increment, and
+    `updated_at` is left alone since the drive itself did not change.
+    """
+    if old_status == new_status:
+        return
+    drives = Drive.__table__
+    values = {}
+    if old_status is None:
+        values["applicant_count"] = drives.c.applicant_count + 1
+    elif old_status in DRIVE_STATUS_COUNTERS:
+        column = DRIVE_STATUS_COUNTERS[old_status]
+        values[column] = drives.c[column] - 1
+    if new_status is None:
+        values["applicant_count"] = drives.c.applicant_count - 1
+    elif new_status in DRIVE_STATUS_COUNTERS:
+        column = DRIVE_STATUS_COUNTERS[new_status]
+        values[column] = drives.c[column] + 1
+    if values:
+        connection.execute(
+            update(drives).where(drives.c.id == drive_id).values(updated_at=drives.c.updated_at, **values)
+        )
+
+
+# ORM inserts only; the upsert in applications.py counts its own inserts.
+@event.listens_for(Application, "after_insert")
+def _application_inserted(mapper, connection, target: Application) -> None:
+    adjust_drive_counts(connection, target.drive_id, None, target.status)
+
+
+@event.listens_for(Application, "after_update")
+def _application_updated(mapper, connection, target: Application) -> None:
+    history = inspect(target).attrs.status.history
+    if history.deleted:
+        adjust_drive_counts(connection, target.drive_id, history.deleted[0], target.status)
+
+
+@event.listens_for(Application, "after_delete")
+def _application_deleted(mapper, connection, target: Application) -> None:
+    adjust_drive_counts(connection, target.drive_id, _previous_status(target), None)
+
+
+def _previous_status(target: Application) -> str:
+    history = inspect(target).attrs.status.history
+    return history.deleted[0] if history.deleted else target.status
+
+
+_DRIVE_VISIBILITY_FIELDS = ("status", "is_deleted", "application_deadline", "company_id")
+_COMPANY_VISIBILITY_FIELDS = ("approval_status", "is_blacklisted")
+
+
+def _changed(obj, fields) -> bool:
+    attrs = inspect(obj).attrs
+    return any(attrs[name].history.has_changes() for name in fields)
+
+
+@event.listens_for(Session, "before_flush")
+def _refresh_drive_visibility(session, flush_context, instances) -> None:
+    with session.no_autoflush:
+        for obj in list(session.new) + list(session.dirty):
+            if isinstance(obj, Drive) and (obj in session.new or _changed(obj, _DRIVE_VISIBILITY_FIELDS)):
+                obj.is_visible = obj.compute_visibility(session.get(Company, obj.company_id))
+
+
+@event.listens_for(Session, "after_flush")
+def _fan_out_company_visibility(session, flush_context) -> None:
+    # Approving, rejecting or blacklisting a company changes all of its drives.
+    company_ids = [
+        obj.user_id
+        for obj in session.dirty
+        if isinstance(obj, Company) and _changed(obj, _COMPANY_VISIBILITY_FIELDS)
+    ]
+    if company_ids:
+        drives = Drive.__table__
+        session.connection().execute(
+            update(drives)
+            .where(drives.c.company_id.in_(company_ids))
+            .values(is_visible=Drive.visibility_expr(), updated_at=drives.c.updated_at)
+        )
+
+
+_ACCESS_FIELDS = {
+    User: ("is_active",),
+    Student: ("is_blacklisted",),
+    Company: ("approval_status", "is_blacklisted"),
+}
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_auth_versions(session, flush_context) -> None:
+    user_ids = {
+        inspect(obj).identity[0]
+        for obj in session.dirty
+        if type(obj) in _ACCESS_FIELDS and _changed(obj, _ACCESS_FIELDS[type(obj)])
+    }
+    if user_ids:
+        bump_auth_versions(session.connection(), user_ids)
+
+
+def bump_auth_versions(connection, user_ids) -> None:
+    users = User.__table__
+    connection.execute(
+        update(users)
+        .where(users.c.id.in_(list(user_ids)))
+        .values(auth_version=users.c.auth_version + 1)
+    )
+
+
+def _sync_application_field(session, key_column: str, key, **values) -> None:
+    apps = Application.__table__
+    session.connection().execute(
+        update(apps)
+        .where(apps.c[key_column] == key)
+        .values(updated_at=apps.c.updated_at, **values)
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_application_display_fields(session, flush_context) -> None:
+    for obj in session.dirty:
+        if isinstance(obj, Student) and _changed(obj, ("full_name",)):
+            _sync_application_field(session, "student_id", obj.user_id, student_name=obj.full_name)
+        elif isinstance(obj, Drive) and _changed(obj, ("job_title",)):
+            _sync_application_field(session, "drive_id", obj.id, job_title=obj.job_title)
+        elif isinstance(obj, Company) and _changed(obj, ("company_name",)):
+            # A company can have thousands of applications across its drives:
+            # rewrite them in the background once this transaction commits.
+            session.info.setdefault("renamed_company_ids", set()).add(obj.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _schedule_company_name_resync(session) -> None:
+    company_ids = session.info.pop("renamed_company_ids", None)
+    if company_ids:
+        from .resync import schedule_company_resync
+
+        for company_id in company_ids:
+            schedule_company_resync(company_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_company_name_resync(session) -> None:
+    session.info.pop("renamed_company_ids", None)
+
+
+# Cached admin searches (search_cache.py) whose results depend on each model.
+_SEARCH_SCOPES = {
+    Student: ("students",),
+    User: ("students", "companies"),
+    Company: ("companies", "drives"),
+    Drive: ("drives",),
+}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_search_scopes(session, flush_context) -> None:
+    scopes = set()
+    for obj in chain(session.new, session.deleted, session.dirty):
+        names = _SEARCH_SCOPES.get(type(obj))
+        if names and (obj not in session.dirty or session.is_modified(obj)):
+            scopes.update(names)
+    if scopes:
+        session.info.setdefault("search_scopes", set()).update(scopes)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_search_generations(session) -> None:
+    scopes = session.info.pop("search_scopes", None)
+    if scopes:
+        bump_search_generations(*scopes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_search_scopes(session) -> None:
+    session.info.pop("search_scopes", None)
+
 
 @login_manager.user_loader
 def load_user(user_id: str) -> User | None:
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from sqlalchemy import select, update
+
+from .extensions import db
+from .models import Company, Drive, bump_auth_versions
+from .search_cache import bump_search_generations
+from .suggest import invalidate_suggestions
+
+# Bulk action -> approval status it sets.
+ACTIONS = {"approve": "approved", "reject": "rejected"}
+TARGETS = ("companies", "drives")
+
+
+def moderate(target: str, action: str, ids) -> dict[int, str]:
+    """Approve or reject many companies or drives in one transaction.
+
+    Returns a result per requested id: "updated", "unchanged" (already in that
+    state) or "not_found". The rows change with a single UPDATE; the side
+    effects the ORM listeners apply to single-row edits (drive visibility,
+    session auth versions, caches) are applied explicitly.
+    """
+    status = ACTIONS[action]
+    ids = list(dict.fromkeys(ids))
+
+    if target == "companies":
+        current = dict(
+            db.session.execute(
+                select(Company.user_id, Company.approval_status).where(Company.user_id.in_(ids))
+            ).all()
+        )
+    else:
+        current = dict(db.session.execute(select(Drive.id, Drive.status).where(Drive.id.in_(ids))).all())
+
+    changed = [i for i in ids if i in current and current[i] != status]
+    if changed:
+        if target == "companies":
+            _update_companies(changed, status)
+            scopes = ("companies", "drives")
+        else:
+            _update_drives(changed, status)
+            scopes = ("drives",)
+        db.session.commit()
+        bump_search_generations(*scopes)
+        invalidate_suggestions()
+
+    changed_ids = set(changed)
+    return {
+        i: "not_found" if i not in current else "updated" if i in changed_ids else "unchanged"
+        for i in ids
+    }
+
+
+def _update_companies(ids: list[int], status: str) -> None:
+    companies = Company.__table__
+    drives = Drive.__table__
+    db.session.execute(
+        update(companies).where(companies.c.user_id.in_(ids)).values(approval_status=status)
+    )
+    db.session.execute(
+        update(drives)
+        .where(drives.c.company_id.in_(ids))
+        .values(is_visible=Drive.visibility_expr(), updated_at=drives.c.updated_at)
+    )
+    bump_auth_versions(db.session.connection(), ids)
+
+
+def _update_drives(ids: list[int], status: str) -> None:
+    drives = Drive.__table__
+    db.session.execute(
+        update(drives)
+        .where(drives.c.id.in_(ids))
+        .values(status=status, is_visible=Drive.visibility_expr(status=status))
+    )
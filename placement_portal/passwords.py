@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import time
+
+from flask import current_app
+from sqlalchemy.exc import OperationalError
+from werkzeug.security import (
+    DEFAULT_PBKDF2_ITERATIONS,
+    check_password_hash,
+    generate_password_hash,
+)
+
+from . import metrics
+from .extensions import db
+from .transactions import is_lock_error
+
+# Werkzeug's defaults for a method given without parameters.
+_SCRYPT_DEFAULTS = ("32768", "8", "1")
+
+
+def normalize_method(method: str) -> str:
+    """Spell out Werkzeug's defaults, e.g. "pbkdf2:sha256" -> "pbkdf2:sha256:1000000".
+
+    The result matches the method prefix Werkzeug stores in front of the salt,
+    so it can be compared with existing hashes.
+    """
+    name, *args = method.split(":")
+    if name == "pbkdf2":
+        digest = args[0] if args else "sha256"
+        iterations = args[1] if len(args) > 1 else str(DEFAULT_PBKDF2_ITERATIONS)
+        return f"pbkdf2:{digest}:{int(iterations)}"
+    if name == "scrypt":
+        n, r, p = args if args else _SCRYPT_DEFAULTS
+        return f"scrypt:{int(n)}:{int(r)}:{int(p)}"
+    raise ValueError(f"Unsupported password hash method {method!r}.")
+
+
+def hash_method() -> str:
+    return normalize_method(current_app.config["PASSWORD_HASH_METHOD"])
+
+
+def hash_password(password: str) -> str:
+    return generate_password_hash(password, method=hash_method())
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """True when `password_hash` was made with other parameters than PASSWORD_HASH_METHOD."""
+    return password_hash.split("$", 1)[0] != hash_method()
+
+
+def rehash_if_outdated(user, password: str) -> None:
+    """Re-hash `user`'s password with the configured method after a successful login.
+
+    Only the plain-text password from a login allows this, so old hashes are
+    upgraded as users come back. A lock error just skips the upgrade (the next
+    login retries) rather than failing the login.
+    """
+    if not needs_rehash(user.password_hash):
+        return
+    user.password_hash = hash_password(password)
+    try:
+        db.session.commit()
+    except OperationalError as exc:
+        db.session.rollback()
+        if not is_lock_error(exc):
+            raise
+        metrics.incr("password_rehash_skipped")
+        return
+    metrics.incr("password_rehashes")
+
+
+def measure_check_rate(method: str, seconds: float) -> tuple[float, int]:
+    """Time `check_password_hash` for `method` on this thread.
+
+    Returns (checks per second, number of checks). Hashing is CPU bound and
+    single threaded, so this is also the login rate one core can sustain.
+    """
+    stored = generate_password_hash("benchmark-password", method=method)
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        check_password_hash(stored, "benchmark-password")
+        count += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            return count / (now - start), count
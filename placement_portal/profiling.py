@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import cProfile
+import pstats
+import random
+import re
+from datetime import datetime
+from pathlib import Path
+
+from flask import Flask, current_app, g, request
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+_TOKEN_SALT = "request-profiler"
+
+
+def profiles_dir(app: Flask) -> Path:
+    return Path(app.instance_path) / "profiles"
+
+
+def _serializer(app: Flask) -> URLSafeTimedSerializer:
+    return URLSafeTimedSerializer(app.secret_key, salt=_TOKEN_SALT)
+
+
+def make_profile_token(admin_id: int) -> str:
+    """Signed value for the PROFILER_HEADER request header (shown on the admin page)."""
+    return _serializer(current_app).dumps({"admin": admin_id})
+
+
+def _has_valid_token(app: Flask) -> bool:
+    token = request.headers.get(app.config["PROFILER_HEADER"])
+    if not token:
+        return False
+    try:
+        _serializer(app).loads(token, max_age=app.config["PROFILER_TOKEN_MAX_AGE"])
+    except BadSignature:
+        return False
+    return True
+
+
+def _should_profile(app: Flask) -> bool:
+    if request.endpoint in (None, "static"):
+        return False
+    if _has_valid_token(app):
+        return True
+    rate = app.config["PROFILER_SAMPLE_RATE"]
+    return rate > 0 and random.random() < rate
+
+
+def init_profiler(app: Flask) -> None:
+    """Run selected requests under cProfile and dump `.pstats` files.
+
+    A request is profiled when it carries a valid signed PROFILER_HEADER or is
+    picked by PROFILER_SAMPLE_RATE. Nothing is registered unless
+    PROFILER_ENABLED is set.
+    """
+    if not app.config["PROFILER_ENABLED"]:
+        return
+
+    @app.before_request
+    def _start_profile():
+        if not _should_profile(app):
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another profiler is already active in this thread
+            return
+        g._profiler = profiler
+
+    @app.teardown_request
+    def _finish_profile(exc):
+        profiler = g.pop("_profiler", None)
+        if profiler is None:
+            return
+        profiler.disable()
+        try:
+            _dump(app, profiler, request.endpoint or "unknown")
+        except OSError:
+            app.logger.exception("Could not write request profile")
+
+
+def _dump(app: Flask, profiler: cProfile.Profile, endpoint: str) -> None:
+    directory = profiles_dir(app)
+    directory.mkdir(parents=True, exist_ok=True)
+    safe_endpoint = re.sub(r"[^A-Za-z0-9_.-]", "_", endpoint)
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    profiler.dump_stats(directory / f"{safe_endpoint}-{stamp}.pstats")
+    _enforce_cap(directory, app.config["PROFILER_MAX_FILES"], app.config["PROFILER_MAX_BYTES"])
+
+
+def _enforce_cap(directory: Path, max_files: int, max_bytes: int) -> None:
+    """Delete the oldest dumps until both the file-count and size caps hold."""
+    files = sorted(directory.glob("*.pstats"), key=lambda p: p.stat().st_mtime, reverse=True)
+    total = 0
+    for index, path in enumerate(files):
+        total += path.stat().st_size
+        if index >= max_files or total > max_bytes:
+            path.unlink(missing_ok=True)
+
+
+def list_profiles(app: Flask, limit: int = 20, top: int = 10) -> list[dict]:
+    """Newest dumps first, each with its `top` functions by cumulative time."""
+    directory = profiles_dir(app)
+    if not directory.exists():
+        return []
+
+    files = sorted(directory.glob("*.pstats"), key=lambda p: p.stat().st_mtime, reverse=True)
+    profiles = []
+    for path in files[:limit]:
+        try:
+            stats = pstats.Stats(str(path))
+        except (OSError, EOFError, TypeError, ValueError):
+            continue
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+        profiles.append(
+            {
+                "name": path.name,
+                "size": path.stat().st_size,
+                "created_at": datetime.utcfromtimestamp(path.stat().st_mtime),
+                "total_time": stats.total_tt,
+                "top": [
+                    {
+                        "function": pstats.func_std_string(func),
+                        "ncalls": nc,
+                        "cumtime": ct,
+                    }
+                    for func, (cc, nc, tt, ct, callers) in rows
+                ],
+            }
+        )
+    return profiles
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import heapq
+
+from sqlalchemy import func, select
+
+from .extensions import db
+from .models import Application, Drive, Student
+from .readmodels import application_rows
+from .suggest import split_skills
+
+SORTS = ("rank", "date")
+
+# Both signals are scaled to 0..1 before weighting.
+CGPA_WEIGHT = 0.6
+SKILL_WEIGHT = 0.4
+MAX_CGPA = 10.0
+
+
+class RankedApplicant:
+    """An application row (from `readmodels.application_rows()` plus the
+    student's cgpa/skills/has_resume) with its ranking score."""
+
+    __slots__ = ("application", "score", "skill_match", "matched_skills")
+
+    def __init__(self, application, score: float, skill_match: float, matched_skills: list[str]):
+        self.application = application
+        self.score = score
+        self.skill_match = skill_match
+        self.matched_skills = matched_skills
+
+
+def skill_set(value: str | None) -> frozenset[str]:
+    return frozenset(s.lower() for s in split_skills(value))
+
+
+def score_applicant(cgpa: float | None, skills: frozenset[str], required: frozenset[str]) -> tuple[float, float]:
+    """Return (score, skill_match) for one applicant."""
+    skill_match = len(skills & required) / len(required) if required else 0.0
+    cgpa_part = min(cgpa or 0.0, MAX_CGPA) / MAX_CGPA
+    return CGPA_WEIGHT * cgpa_part + SKILL_WEIGHT * skill_match, skill_match
+
+
+def applicant_page(drive: Drive, sort: str, page: int, per_page: int) -> tuple[list[RankedApplicant], int]:
+    """One page of a drive's applicants and the total number of applicants.
+
+    With sort="rank" the scores are computed while streaming a compact
+    (id, cgpa, skills) projection, keeping only the best page * per_page in a
+    heap; full rows are then loaded for that page only. sort="date" pages in
+    SQL, newest first.
+    """
+    required = skill_set(drive.required_skills)
+    if sort == "rank":
+        ids, total = _ranked_ids(drive.id, required, page, per_page)
+    else:
+        total = db.session.scalar(
+            select(func.count()).select_from(Application).where(Application.drive_id == drive.id)
+        )
+        ids = db.session.scalars(
+            select(Application.id)
+            .where(Application.drive_id == drive.id)
+            .order_by(Application.application_date.desc())
+            .limit(per_page)
+            .offset((page - 1) * per_page)
+        ).all()
+
+    rows = {
+        row.id: row
+        for row in db.session.execute(
+            application_rows()
+            .add_columns(
+                Student.cgpa,
+                Student.skills,
+                Student.resume_path.isnot(None).label("has_resume"),
+            )
+            .outerjoin(Student, Student.user_id == Application.student_id)
+            .where(Application.id.in_(ids))
+        )
+    }
+
+    applicants = []
+    for app_id in ids:
+        row = rows.get(app_id)
+        if row is None:
+            continue
+        skills = skill_set(row.skills)
+        score, skill_match = score_applicant(row.cgpa, skills, required)
+        matched = sorted(skills & required)
+        applicants.append(RankedApplicant(row, round(score, 4), round(skill_match, 4), matched))
+    return applicants, total
+
+
+def _ranked_ids(drive_id: int, required: frozenset[str], page: int, per_page: int) -> tuple[list[int], int]:
+    rows = db.session.execute(
+        select(Application.id, Student.cgpa, Student.skills)
+        .outerjoin(Student, Student.user_id == Application.student_id)
+        .where(Application.drive_id == drive_id)
+        .execution_options(yield_per=1000)
+    )
+    total = 0
+
+    def scored():
+        nonlocal total
+        for app_id, cgpa, skills in rows:
+            total += 1
+            # Ties go to the earlier application (smaller id).
+            yield score_applicant(cgpa, skill_set(skills), required)[0], -app_id
+
+    top = heapq.nlargest(page * per_page, scored())
+    return [-neg_id for _, neg_id in top[(page - 1) * per_page :]], total
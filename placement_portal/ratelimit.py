@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import math
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, request
+
+from . import metrics
+
+_limiter_lock = threading.Lock()
+
+
+def _refill(tokens: float, updated: float, now: float, capacity: float, rate: float) -> float:
+    return min(capacity, tokens + max(now - updated, 0.0) * rate)
+
+
+def _wait(tokens: float, rate: float) -> float:
+    """Seconds until a bucket holding `tokens` has a whole token again."""
+    return (1 - tokens) / rate
+
+
+class MemoryBuckets:
+    """Token buckets held in this worker, least recently used dropped first.
+
+    Dropping a bucket only forgets its debt (it comes back full), so the
+    bound on keys errs on the side of letting requests through.
+    """
+
+    def __init__(self, max_keys: int):
+        self._max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def take(self, key: str, capacity: float, rate: float) -> float:
+        """Take one token; returns 0 on success, else seconds to wait."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = _refill(tokens, updated, now, capacity, rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = _wait(tokens, rate)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+
+class SqliteBuckets:
+    """Token buckets in a small SQLite file shared by all workers on a host.
+
+    Each take is one BEGIN IMMEDIATE transaction, so concurrent workers never
+    spend the same token. Full buckets are equivalent to missing ones and get
+    pruned now and then.
+    """
+
+    _PRUNE_PROBABILITY = 0.01
+
+    def __init__(self, path: str, max_idle_seconds: float):
+        self._path = path
+        self._max_idle = max_idle_seconds
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets "
+                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, capacity: float, rate: float) -> float:
+        """Take one token; returns 0 on success, else seconds to wait."""
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens = capacity if row is None else _refill(row[0], row[1], now, capacity, rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = _wait(tokens, rate)
+            conn.execute(
+                "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+            if random.random() < self._PRUNE_PROBABILITY:
+                conn.execute("DELETE FROM buckets WHERE updated < ?", (now - self._max_idle,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+
+def get_login_buckets() -> MemoryBuckets | SqliteBuckets:
+    app = current_app._get_current_object()
+    with _limiter_lock:
+        buckets = app.extensions.get("login_rate_buckets")
+        if buckets is None:
+            config = app.config
+            if config["LOGIN_RATE_LIMIT_STORAGE"] == "sqlite":
+                # Idle this long, every bucket has refilled completely.
+                max_idle = max(
+                    config["LOGIN_RATE_LIMIT_IP_BURST"] / config["LOGIN_RATE_LIMIT_IP_PER_MINUTE"],
+                    config["LOGIN_RATE_LIMIT_EMAIL_BURST"] / config["LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE"],
+                ) * 60
+                buckets = SqliteBuckets(config["LOGIN_RATE_LIMIT_SQLITE_PATH"], max_idle)
+            else:
+                buckets = MemoryBuckets(config["LOGIN_RATE_LIMIT_MAX_KEYS"])
+            app.extensions["login_rate_buckets"] = buckets
+    return buckets
+
+
+def login_retry_after(email: str) -> int:
+    """Spend a login attempt for the client IP and `email`.
+
+    Returns 0 when the attempt may go ahead, else the whole seconds to wait.
+    Call it before looking up the user so rejected attempts never reach the
+    password hash. The IP bucket is checked first; an attempt it rejects does
+    not cost the email bucket anything.
+    """
+    config = current_app.config
+    if not config["LOGIN_RATE_LIMIT_ENABLED"]:
+        return 0
+
+    buckets = get_login_buckets()
+    checks = [
+        (
+            "ip",
+            f"ip:{request.remote_addr}",
+            config["LOGIN_RATE_LIMIT_IP_BURST"],
+            config["LOGIN_RATE_LIMIT_IP_PER_MINUTE"],
+        ),
+    ]
+    if email:
+        checks.append(
+            (
+                "email",
+                f"email:{email}",
+                config["LOGIN_RATE_LIMIT_EMAIL_BURST"],
+                config["LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE"],
+            )
+        )
+
+    for name, key, burst, per_minute in checks:
+        try:
+            wait = buckets.take(key, burst, per_minute / 60)
+        except sqlite3.OperationalError:
+            # A busy limiter store must not lock everyone out.
+            metrics.incr("login_rate_limit_errors")
+            return 0
+        if wait:
+            metrics.incr(f"login_rate_limited_{name}")
+            return max(1, math.ceil(wait))
+    return 0
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from sqlalchemy import select
+
+from .models import Application, Company, Drive, Placement
+
+# Read-only Core selects for pure listings. Executing them returns plain `Row`
+# tuples (attribute access by column name) instead of ORM objects, so there
+# is no identity map, no lazy loading and no per-object state to build. Add
+# filters with `.where(...)`; never use the rows for writes.
+
+
+def drive_rows():
+    """Columns of `drive_to_dict`, with the company name joined in."""
+    return (
+        select(
+            Drive.id,
+            Drive.company_id,
+            Company.company_name,
+            Drive.job_title,
+            Drive.job_description,
+            Drive.eligibility_criteria,
+            Drive.required_skills,
+            Drive.min_cgpa,
+            Drive.salary_min,
+            Drive.salary_max,
+            Drive.location,
+            Drive.min_experience_years,
+            Drive.application_deadline,
+            Drive.status,
+            Drive.is_deleted,
+            Drive.created_at,
+            Drive.updated_at,
+        )
+        .select_from(Drive)
+        .outerjoin(Company, Company.user_id == Drive.company_id)
+    )
+
+
+def application_rows():
+    """Columns of `application_to_dict` (names are denormalized on the row)."""
+    return (
+        select(
+            Application.id,
+            Application.student_id,
+            Application.student_name,
+            Application.student_uid,
+            Application.drive_id,
+            Application.job_title,
+            Application.company_id,
+            Application.company_name,
+            Application.status,
+            Application.application_date,
+            Application.updated_at,
+            Placement.id.label("placement_id"),
+        )
+        .select_from(Application)
+        .outerjoin(Placement, Placement.application_id == Application.id)
+    )
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask, current_app
+from sqlalchemy import func, or_, select, update
+
+from .extensions import db
+from .models import DRIVE_STATUS_COUNTERS, Application, Company, Drive, Notification, Student, User
+from .search_cache import bump_search_generations
+from .suggest import invalidate_suggestions
+from .transactions import run_with_lock_retry
+
+_executor_lock = threading.Lock()
+
+
+def schedule_company_resync(company_id: int) -> None:
+    """Rewrite `Application.company_name` for a renamed company in the background."""
+    app = current_app._get_current_object()
+    with _executor_lock:
+        executor = app.extensions.get("resync_executor")
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resync")
+            app.extensions["resync_executor"] = executor
+    executor.submit(_run_company_resync, app, company_id)
+
+
+def _run_company_resync(app: Flask, company_id: int) -> None:
+    with app.app_context():
+        try:
+            resync_company_names(company_id, app.config["APPLICATION_RESYNC_BATCH_SIZE"])
+        except Exception:
+            db.session.rollback()
+            app.logger.exception("Resyncing application company names failed (company %s)", company_id)
+
+
+def resync_company_names(company_id: int, batch_size: int) -> int:
+    """Copy the current company name onto its applications, one batch per commit."""
+    name = db.session.scalar(select(Company.company_name).where(Company.user_id == company_id))
+    if name is None:
+        return 0
+
+    total = 0
+    while True:
+        updated = run_with_lock_retry(_resync_company_batch, company_id, name, batch_size)
+        if not updated:
+            return total
+        total += updated
+
+
+def _resync_company_batch(company_id: int, name: str, batch_size: int) -> int:
+    ids = db.session.scalars(
+        select(Application.id)
+        .where(Application.company_id == company_id, Application.company_name.is_distinct_from(name))
+        .limit(batch_size)
+    ).all()
+    if ids:
+        apps = Application.__table__
+        db.session.execute(
+            update(apps)
+            .where(apps.c.id.in_(ids))
+            .values(company_name=name, updated_at=apps.c.updated_at)
+        )
+        db.session.commit()
+    return len(ids)
+
+
+def resync_all_application_names(batch_size: int) -> int:
+    """Recompute every denormalized display field on `applications` by id range."""
+    apps = Application.__table__
+    max_id = db.session.scalar(select(func.max(apps.c.id))) or 0
+
+    student = select(Student).where(Student.user_id == apps.c.student_id)
+    drive = select(Drive).where(Drive.id == apps.c.drive_id)
+    values = {
+        "student_name": student.with_only_columns(Student.full_name).scalar_subquery(),
+        "student_uid": student.with_only_columns(Student.student_uid).scalar_subquery(),
+        "job_title": drive.with_only_columns(Drive.job_title).scalar_subquery(),
+        "company_id": drive.with_only_columns(Drive.company_id).scalar_subquery(),
+        "company_name": select(Company.company_name)
+        .join(Drive, Drive.company_id == Company.user_id)
+        .where(Drive.id == apps.c.drive_id)
+        .scalar_subquery(),
+        "updated_at": apps.c.updated_at,
+    }
+
+    total = 0
+    for low in range(1, max_id + 1, batch_size):
+        stmt = update(apps).where(apps.c.id.between(low, low + batch_size - 1)).values(**values)
+
+        def _batch(stmt=stmt) -> int:
+            result = db.session.execute(stmt)
+            db.session.commit()
+            return result.rowcount
+
+        total += run_with_lock_retry(_batch)
+    return total
+
+
+def recount_drive_applicants(batch_size: int) -> int:
+    """Recompute the application counters on `drives` by id range.
+
+    Only drives whose stored counts differ are written (`updated_at` kept);
+    returns how many were corrected.
+    """
+    drives = Drive.__table__
+    max_id = db.session.scalar(select(func.max(drives.c.id))) or 0
+
+    def count(*criteria):
+        return (
+            select(func.count())
+            .select_from(Application)
+            .where(Application.drive_id == drives.c.id, *criteria)
+            .scalar_subquery()
+        )
+
+    values = {"applicant_count": count()}
+    for status, column in DRIVE_STATUS_COUNTERS.items():
+        values[column] = count(Application.status == status)
+    drifted = or_(*(drives.c[column] != actual for column, actual in values.items()))
+
+    total = 0
+    for low in range(1, max_id + 1, batch_size):
+        stmt = (
+            update(drives)
+            .where(drives.c.id.between(low, low + batch_size - 1), drifted)
+            .values(updated_at=drives.c.updated_at, **values)
+        )
+
+        def _batch(stmt=stmt) -> int:
+            result = db.session.execute(stmt)
+            db.session.commit()
+            return result.rowcount
+
+        total += run_with_lock_retry(_batch)
+    return total
+
+
+def recompute_drive_visibility(batch_size: int) -> int:
+    """Recompute `drives.is_visible` by id range.
+
+    Only drives whose stored flag differs are written (`updated_at` kept);
+    returns how many were corrected.
+    """
+    drives = Drive.__table__
+    max_id = db.session.scalar(select(func.max(drives.c.id))) or 0
+    visible = Drive.visibility_expr()
+
+    total = 0
+    for low in range(1, max_id + 1, batch_size):
+        stmt = (
+            update(drives)
+            .where(drives.c.id.between(low, low + batch_size - 1), drives.c.is_visible != visible)
+            .values(is_visible=visible, updated_at=drives.c.updated_at)
+        )
+
+        def _batch(stmt=stmt) -> int:
+            result = db.session.execute(stmt)
+            db.session.commit()
+            return result.rowcount
+
+        total += run_with_lock_retry(_batch)
+    if total:
+        bump_search_generations("drives")
+        invalidate_suggestions()
+    return total
+
+
+def recount_unread_notifications(batch_size: int) -> int:
+    """Recompute `users.unread_notification_count` by user id range.
+
+    Only users whose stored count differs are written; returns how many were
+    corrected.
+    """
+    users = User.__table__
+    max_id = db.session.scalar(select(func.max(users.c.id))) or 0
+    actual = (
+        select(func.count())
+        .select_from(Notification)
+        .where(Notification.user_id == users.c.id, Notification.is_read.is_(False))
+        .scalar_subquery()
+    )
+
+    total = 0
+    for low in range(1, max_id + 1, batch_size):
+        stmt = (
+            update(users)
+            .where(
+                users.c.id.between(low, low + batch_size - 1),
+                users.c.unread_notification_count != actual,
+            )
+            .values(unread_notification_count=actual)
+        )
+
+        def _batch(stmt=stmt) -> int:
+            result = db.session.execute(stmt)
+            db.session.commit()
+            return result.rowcount
+
+        total += run_with_lock_retry(_batch)
+    return total
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from flask import Flask
+from sqlalchemy import select, update
+
+from .extensions import db
+from .models import Drive
+from .search_cache import bump_search_generations
+from .suggest import invalidate_suggestions
+from .transactions import run_with_lock_retry
+
+# Drives in these states stop accepting applications once their deadline passes.
+_CLOSABLE_STATUSES = ("pending", "approved")
+
+
+def close_expired_drives(batch_size: int, today: date | None = None) -> int:
+    """Flip drives whose deadline has passed to `closed`; returns how many.
+
+    Runs in batches (one transaction each) so the write lock is never held for
+    long. Student-facing queries rely on this job and filter on `status` only.
+    """
+    today = today or date.today()
+    total = 0
+    while True:
+        closed = run_with_lock_retry(_close_batch, batch_size, today)
+        if not closed:
+            if total:
+                bump_search_generations("drives")
+                invalidate_suggestions()
+            return total
+        total += closed
+
+
+def _close_batch(batch_size: int, today: date) -> int:
+    ids = db.session.scalars(
+        select(Drive.id)
+        .where(Drive.status.in_(_CLOSABLE_STATUSES), Drive.application_deadline < today)
+        .limit(batch_size)
+    ).all()
+    if ids:
+        db.session.execute(
+            update(Drive)
+            .where(Drive.id.in_(ids))
+            .values(status="closed", is_visible=False)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+    return len(ids)
+
+
+class ExpiredDriveCloser:
+    """Background thread that runs `close_expired_drives` shortly after midnight.
+
+    It also runs once at start-up to catch up on anything missed while the
+    server was down. Every worker runs its own copy; the job is idempotent.
+    """
+
+    def __init__(self, app: Flask):
+        self._app = app
+        self._thread = threading.Thread(target=self._run, name="expired-drive-closer", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._run_once()
+            time.sleep(self._seconds_until_next_run())
+
+    def _run_once(self) -> None:
+        with self._app.app_context():
+            try:
+                closed = close_expired_drives(self._app.config["DRIVE_AUTO_CLOSE_BATCH_SIZE"])
+            except Exception:
+                db.session.rollback()
+                self._app.logger.exception("Closing expired drives failed")
+                return
+        if closed:
+            self._app.logger.info("Closed %d expired drive(s)", closed)
+
+    def _seconds_until_next_run(self) -> float:
+        now = datetime.now()
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        delay = self._app.config["DRIVE_AUTO_CLOSE_DELAY_SECONDS"]
+        return (next_midnight - now).total_seconds() + delay
+
+
+def init_scheduler(app: Flask) -> None:
+    """Start the expired-drive closer with the first request this worker serves.
+
+    Starting lazily keeps `flask` CLI commands from spawning the thread.
+    """
+    if not app.config["DRIVE_AUTO_CLOSE_ENABLED"]:
+        return
+
+    lock = threading.Lock()
+    started = False
+
+    @app.before_request
+    def _start_scheduler():
+        nonlocal started
+        if started:
+            return
+        with lock:
+            if not started:
+                ExpiredDriveCloser(app).start()
+                started = True
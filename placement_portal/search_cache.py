@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, request
+
+from . import metrics
+
+_cache_lock = threading.Lock()
+
+# Hydrating more ids than this per IN (...) would approach SQLite's bind limit.
+_HYDRATE_CHUNK = 500
+
+
+class SearchCache:
+    """Bounded LRU + TTL cache of admin search results, stored as primary keys.
+
+    Each entry belongs to a scope ("students", "companies", "drives") and
+    remembers that scope's generation when it was computed. Committed writes
+    to the models behind a scope bump its generation (see the listeners in
+    models.py), which makes every older entry of that scope a miss.
+
+    Generations are per worker: a write served by another worker is only
+    picked up once the entry's TTL runs out.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, tuple[int, float, list]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+
+    def generation(self, scope: str) -> int:
+        with self._lock:
+            return self._generations.get(scope, 0)
+
+    def bump(self, *scopes: str) -> None:
+        with self._lock:
+            for scope in scopes:
+                self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def get(self, scope: str, key: tuple) -> list | None:
+        with self._lock:
+            entry = self._entries.get((scope, key))
+            if entry is None:
+                return None
+            generation, expires_at, ids = entry
+            if generation != self._generations.get(scope, 0) or expires_at <= time.monotonic():
+                del self._entries[(scope, key)]
+                return None
+            self._entries.move_to_end((scope, key))
+            return ids
+
+    def put(self, scope: str, key: tuple, generation: int, ids: list) -> None:
+        with self._lock:
+            # A write committed while the search ran: the ids may already be stale.
+            if generation != self._generations.get(scope, 0):
+                return
+            self._entries[(scope, key)] = (generation, time.monotonic() + self._ttl, ids)
+            self._entries.move_to_end((scope, key))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+def get_search_cache() -> SearchCache:
+    app = current_app._get_current_object()
+    with _cache_lock:
+        cache = app.extensions.get("search_cache")
+        if cache is None:
+            cache = SearchCache(
+                max_entries=app.config["SEARCH_CACHE_MAX_ENTRIES"],
+                ttl=app.config["SEARCH_CACHE_TTL_SECONDS"],
+            )
+            app.extensions["search_cache"] = cache
+    return cache
+
+
+def bump_search_generations(*scopes: str) -> None:
+    """Invalidate cached searches of `scopes` (call after committing bulk Core updates)."""
+    if scopes:
+        get_search_cache().bump(*scopes)
+
+
+def normalize_query(q: str) -> str:
+    return " ".join(q.lower().split())
+
+
+def cached_search(scope: str, filters: tuple, query, model, pk) -> list:
+    """Run `query` (a `Model.query` search) through the cache.
+
+    `filters` holds the normalized search inputs. On a miss only the primary
+    keys are selected and stored; either way the rows are then loaded by id,
+    in the query's original order.
+    """
+    cache = get_search_cache()
+    key = (request.endpoint, *filters)
+    ids = cache.get(scope, key)
+    if ids is None:
+        metrics.incr("search_cache_misses")
+        generation = cache.generation(scope)
+        ids = [row[0] for row in query.with_entities(pk)]
+        cache.put(scope, key, generation, ids)
+    else:
+        metrics.incr("search_cache_hits")
+
+    by_id = {}
+    for start in range(0, len(ids), _HYDRATE_CHUNK):
+        for obj in model.query.filter(pk.in_(ids[start : start + _HYDRATE_CHUNK])):
+            by_id[getattr(obj, pk.key)] = obj
+    return [by_id[i] for i in ids if i in by_id]
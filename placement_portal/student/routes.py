@@ -9,9 +9,12 @@ from flask_login import current_user, login_required, logout_user
 from sqlalchemy import func
 from werkzeug.utils import secure_filename
 
+from ..applications import submit_application
+from ..authz import session_access_ok
 from ..decorators import roles_required
 from ..extensions import db
 from ..models import Application, Company, Drive, Notification, Placement, Student
+from ..transactions import run_with_lock_retry, write_transaction
 from .forms import StudentProfileForm
 
 bp = Blueprint("student", __name__)
@@ -25,8 +28,7 @@ def _student_guard():
     if current_user.role != "student":
         abort(403)
 
-    student = current_user.student_profile
-    if student is None or not current_user.is_active or student.is_blacklisted:
+    if not session_access_ok(current_user):
         logout_user()
         flash("Student access revoked. Contact the placement cell.", "danger")
         return redirect(url_for("auth.login"))
@@ -38,20 +40,11 @@ def _student_guard():
 def dashboard():
     q = (request.args.get("q") or "").strip()
 
-    drives_query = (
-        Drive.query.join(Company, Drive.company_id == Company.user_id)
-        .filter(
-            Drive.status == "approved",
-            Drive.is_deleted.is_(False),
-            Company.approval_status == "approved",
-            Company.is_blacklisted.is_(False),
-        )
-        .filter((Drive.application_deadline.is_(None)) | (Drive.application_deadline >= date.today()))
-    )
+    drives_query = Drive.query.filter(Drive.is_visible.is_(True))
 
     if q:
         like = f"%{q}%"
-        drives_query = drives_query.filter(
+        drives_query = drives_query.join(Company, Drive.company_id == Company.user_id).filter(
             (Drive.job_title.ilike(like))
             | (Company.company_name.ilike(like))
             | (Drive.required_skills.ilike(like))
@@ -109,9 +102,7 @@ def dashboard():
 @roles_required("student")
 def drive_detail(drive_id: int):
     drive = Drive.query.get_or_404(drive_id)
-    if drive.is_deleted or drive.status != "approved":
-        abort(404)
-    if drive.company.approval_status != "approved" or drive.company.is_blacklisted:
+    if not drive.is_visible:
         abort(404)
     if drive.application_deadline and drive.application_deadline < date.today():
         abort(404)
@@ -123,25 +114,22 @@ def drive_detail(drive_id: int):
 @bp.post("/drives/<int:drive_id>/apply")
 @login_required
 @roles_required("student")
+@write_transaction
 def apply(drive_id: int):
     drive = Drive.query.get_or_404(drive_id)
-    if drive.is_deleted or drive.status != "approved":
-        flash("This drive is not available.", "warning")
-        return redirect(url_for("student.dashboard"))
-    if drive.company.approval_status != "approved" or drive.company.is_blacklisted:
+    if not drive.is_visible:
         flash("This drive is not available.", "warning")
         return redirect(url_for("student.dashboard"))
     if drive.application_deadline and drive.application_deadline < date.today():
         flash("Application deadline has passed.", "warning")
         return redirect(url_for("student.dashboard"))
 
-    existing = Application.query.filter_by(student_id=current_user.id, drive_id=drive.id).first()
-    if existing is not None:
+    _, created = submit_application(current_user.id, drive.id)
+    db.session.commit()
+    if not created:
         flash("You have already applied to this drive.", "info")
         return redirect(url_for("student.drive_detail", drive_id=drive.id))
 
-    db.session.add(Application(student_id=current_user.id, drive_id=drive.id, status="applied"))
-    db.session.commit()
     flash("Application submitted.", "success")
     return redirect(url_for("student.dashboard"))
 
@@ -160,39 +148,59 @@ def _save_resume(file_storage) -> str:
     return str(Path("uploads") / "resumes" / stored_name)
 
 
+def _discard_resume(rel_path: str | None) -> None:
+    if rel_path:
+        (Path(current_app.instance_path) / rel_path).unlink(missing_ok=True)
+
+
 @bp.route("/profile", methods=["GET", "POST"])
 @login_required
 @roles_required("student")
 def profile():
+    # Not @write_transaction: a lock retry would re-run the upload below, whose
+    # stream is already consumed. The file is saved once; only the DB writes retry.
     student = Student.query.get_or_404(current_user.id)
     form = StudentProfileForm(obj=student)
 
     if form.validate_on_submit():
-        student.full_name = form.full_name.data.strip()
-        student.degree = (form.degree.data or "").strip() or None
-        student.department = (form.department.data or "").strip() or None
-        student.graduation_year = form.graduation_year.data
-        student.cgpa = float(form.cgpa.data) if form.cgpa.data is not None else None
-        student.phone = (form.phone.data or "").strip() or None
-        student.skills = (form.skills.data or "").strip() or None
-
+        resume_path = None
         if form.resume.data:
             try:
-                student.resume_path = _save_resume(form.resume.data)
+                resume_path = _save_resume(form.resume.data)
             except ValueError as e:
                 flash(str(e), "danger")
                 return redirect(url_for("student.profile"))
 
-        db.session.commit()
+        try:
+            run_with_lock_retry(_update_profile, student.user_id, form, resume_path)
+        except Exception:
+            _discard_resume(resume_path)
+            raise
+
         flash("Profile updated.", "success")
         return redirect(url_for("student.profile"))
 
     return render_template("student/profile.html", form=form, student=student)
 
 
+def _update_profile(student_id: int, form: StudentProfileForm, resume_path: str | None) -> None:
+    student = db.session.get(Student, student_id)
+    student.full_name = form.full_name.data.strip()
+    student.degree = (form.degree.data or "").strip() or None
+    student.department = (form.department.data or "").strip() or None
+    student.graduation_year = form.graduation_year.data
+    student.cgpa = float(form.cgpa.data) if form.cgpa.data is not None else None
+    student.phone = (form.phone.data or "").strip() or None
+    student.skills = (form.skills.data or "").strip() or None
+    if resume_path:
+        student.resume_path = resume_path
+    db.session.commit()
+
+
 @bp.post("/notifications/<int:notification_id>/read")
 @login_required
 @roles_required("student")
+@write_transaction
 def mark_notification_read(notification_id: int):
     notif = Notification.query.get_or_404(notification_id)
     if notif.user_id != current_user.id:
@@ -201,3 +209,14 @@ def mark_notification_read(notification_id: int):
     db.session.commit()
     flash("Notification marked as read.", "info")
     return redirect(url_for("student.dashboard"))
+
+
+@bp.post("/notifications/read-all")
+@login_required
+@roles_required("student")
+@write_transaction
+def mark_all_notifications_read():
+    Notification.mark_all_read(current_user.id)
+    db.session.commit()
+    flash("All notifications marked as read.", "info")
+    return redirect(url_for("student.dashboard"))
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from itertools import chain
+
+from flask import current_app
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from .extensions import db
+from .models import Company, Drive
+
+KINDS = ("company", "title", "skill")
+
+# Sorts after every key that starts with a given prefix.
+_MAX_CHAR = chr(0x10FFFF)
+
+_index_lock = threading.Lock()
+
+
+def split_skills(value: str | None) -> list[str]:
+    return [s.strip() for s in (value or "").split(",") if s.strip()]
+
+
+def _drive_terms(job_title, required_skills, is_visible) -> list[tuple[str, str]]:
+    if not is_visible:
+        return []
+    return [("title", job_title)] + [("skill", s) for s in split_skills(required_skills)]
+
+
+def _company_terms(company_name, approval_status, is_blacklisted) -> list[tuple[str, str]]:
+    if approval_status != "approved" or is_blacklisted:
+        return []
+    return [("company", company_name)]
+
+
+class PrefixIndex:
+    """Sorted, case-insensitive prefix index over public suggestion terms.
+
+    Each kind keeps a sorted list of lowercased terms plus a reference count
+    (several drives can share a title or skill). A lookup bisects to the
+    prefix range and returns its most common terms first. Only approved,
+    non-blacklisted companies and visible drives contribute, which makes the
+    same suggestions safe for every role.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: dict[str, list[str]] = {kind: [] for kind in KINDS}
+        self._counts: dict[str, dict[str, int]] = {kind: {} for kind in KINDS}
+        self._labels: dict[str, dict[str, str]] = {kind: {} for kind in KINDS}
+        self.built_at = 0.0
+        self.stale = True
+
+    def rebuild(self) -> None:
+        counts: dict[str, dict[str, int]] = {kind: {} for kind in KINDS}
+        labels: dict[str, dict[str, str]] = {kind: {} for kind in KINDS}
+
+        companies = db.session.execute(
+            select(Company.company_name, Company.approval_status, Company.is_blacklisted)
+        )
+        drives = db.session.execute(
+            select(Drive.job_title, Drive.required_skills, Drive.is_visible).where(
+                Drive.is_visible.is_(True)
+            )
+        )
+        terms = chain.from_iterable(
+            chain((_company_terms(*row) for row in companies), (_drive_terms(*row) for row in drives))
+        )
+        for kind, term in terms:
+            key = term.lower()
+            counts[kind][key] = counts[kind].get(key, 0) + 1
+            labels[kind].setdefault(key, term)
+
+        with self._lock:
+            self._counts = counts
+            self._labels = labels
+            self._keys = {kind: sorted(counts[kind]) for kind in KINDS}
+            self.built_at = time.monotonic()
+            self.stale = False
+
+    def apply(self, deltas: list[tuple[str, str, int]]) -> None:
+        with self._lock:
+            for kind, term, delta in deltas:
+                key = term.lower()
+                counts, keys = self._counts[kind], self._keys[kind]
+                count = counts.get(key, 0) + delta
+                if count > 0:
+                    if key not in counts:
+                        insort(keys, key)
+                        self._labels[kind][key] = term
+                    counts[key] = count
+                elif key in counts:
+                    del counts[key]
+                    del self._labels[kind][key]
+                    del keys[bisect_left(keys, key)]
+
+    def lookup(self, kind: str, prefix: str, limit: int) -> list[str]:
+        """The `limit` most common terms starting with `prefix` (ties alphabetical)."""
+        prefix = prefix.lower()
+        with self._lock:
+            keys, counts, labels = self._keys[kind], self._counts[kind], self._labels[kind]
+            start = bisect_left(keys, prefix)
+            end = bisect_left(keys, prefix + _MAX_CHAR, start)
+            top = heapq.nsmallest(limit, keys[start:end], key=lambda key: (-counts[key], key))
+            return [labels[key] for key in top]
+
+
+def get_suggest_index() -> PrefixIndex:
+    """This worker's index, (re)built when missing, invalidated or older than
+    SUGGEST_REBUILD_SECONDS (which also picks up other workers' writes)."""
+    app = current_app._get_current_object()
+    with _index_lock:
+        index = app.extensions.get("suggest_index")
+        if index is None:
+            index = PrefixIndex()
+            app.extensions["suggest_index"] = index
+        max_age = app.config["SUGGEST_REBUILD_SECONDS"]
+        if index.stale or time.monotonic() - index.built_at > max_age:
+            index.rebuild()
+    return index
+
+
+def invalidate_suggestions() -> None:
+    """Force a rebuild on next use (call after bulk Core updates of drives/companies)."""
+    index = current_app.extensions.get("suggest_index")
+    if index is not None:
+        index.stale = True
+
+
+def _previous(obj, name: str):
+    history = inspect(obj).attrs[name].history
+    return history.deleted[0] if history.deleted else getattr(obj, name)
+
+
+_DRIVE_FIELDS = ("job_title", "required_skills", "is_visible")
+_COMPANY_FIELDS = ("company_name", "approval_status", "is_blacklisted")
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_suggest_changes(session, flush_context) -> None:
+    deltas = []
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Drive):
+            fields, terms = _DRIVE_FIELDS, _drive_terms
+        elif isinstance(obj, Company):
+            fields, terms = _COMPANY_FIELDS, _company_terms
+        else:
+            continue
+
+        if obj in session.new:
+            old, new = [], terms(*(getattr(obj, f) for f in fields))
+        elif obj in session.deleted:
+            old, new = terms(*(_previous(obj, f) for f in fields)), []
+        else:
+            old = terms(*(_previous(obj, f) for f in fields))
+            new = terms(*(getattr(obj, f) for f in fields))
+        if old == new:
+            continue
+        deltas.extend((kind, term, -1) for kind, term in old)
+        deltas.extend((kind, term, 1) for kind, term in new)
+
+        # Company approval/blacklisting flips is_visible on all of its drives
+        # with a Core UPDATE; those rows never pass through this listener.
+        if isinstance(obj, Company) and bool(old) != bool(new):
+            session.info["suggest_rebuild"] = True
+
+    if deltas:
+        session.info.setdefault("suggest_deltas", []).extend(deltas)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_suggest_changes(session) -> None:
+    deltas = session.info.pop("suggest_deltas", None)
+    rebuild = session.info.pop("suggest_rebuild", False)
+    index = current_app.extensions.get("suggest_index")
+    if index is None:
+        return
+    if rebuild:
+        index.stale = True
+    elif deltas:
+        index.apply(deltas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_suggest_changes(session) -> None:
+    session.info.pop("suggest_deltas", None)
+    session.info.pop("suggest_rebuild", None)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import random
+import time
+from functools import wraps
+
+from flask import current_app
+from sqlalchemy.exc import OperationalError
+from werkzeug.exceptions import ServiceUnavailable
+
+from . import metrics
+from .extensions import db
+
+
+def is_lock_error(exc: BaseException) -> bool:
+    """True for SQLite's `database is locked` / `database table is locked`."""
+    return isinstance(exc, OperationalError) and "locked" in str(exc.orig).lower()
+
+
+def run_with_lock_retry(unit_of_work, *args, **kwargs):
+    """Run `unit_of_work`, retrying the whole thing when SQLite reports a lock.
+
+    Between attempts the session is rolled back and we sleep with full-jitter
+    exponential backoff. When the retries are exhausted a 503 with
+    `Retry-After` is raised instead of letting the OperationalError become a 500.
+    """
+    config = current_app.config
+    attempts = config["DB_LOCK_RETRY_ATTEMPTS"]
+    base = config["DB_LOCK_RETRY_BASE_SECONDS"]
+    cap = config["DB_LOCK_RETRY_MAX_SECONDS"]
+
+    for attempt in range(attempts + 1):
+        try:
+            return unit_of_work(*args, **kwargs)
+        except OperationalError as exc:
+            if not is_lock_error(exc):
+                raise
+            db.session.rollback()
+            if attempt == attempts:
+                metrics.incr("db_lock_giveups")
+                raise ServiceUnavailable(
+                    "The database is busy. Please retry shortly.",
+                    retry_after=config["DB_LOCK_RETRY_AFTER_SECONDS"],
+                ) from exc
+            metrics.incr("db_lock_retries")
+            time.sleep(random.uniform(0, min(cap, base * 2**attempt)))
+
+
+def write_transaction(view_func):
+    """Wrap a write route so lock contention is retried (see run_with_lock_retry)."""
+
+    @wraps(view_func)
+    def wrapped(*args, **kwargs):
+        return run_with_lock_retry(view_func, *args, **kwargs)
+
+    return wrapped
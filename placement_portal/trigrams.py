@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import math
+import re
+
+from flask import current_app
+from sqlalchemy import delete, event, func, insert, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from .extensions import db
+from .models import Student, StudentTrigram, User
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+# Shortest query worth a fuzzy lookup; shorter ones use the plain ilike search.
+MIN_QUERY_LENGTH = 3
+
+_STUDENT_FIELDS = ("full_name", "student_uid", "phone")
+
+
+def trigrams(text: str | None) -> set[str]:
+    """Lowercased trigrams of each word, padded like pg_trgm ("  ab", "ab ")."""
+    grams = set()
+    for word in _WORD_RE.findall((text or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _document_trigrams(full_name, student_uid, phone, email) -> set[str]:
+    return trigrams(" ".join(v for v in (full_name, student_uid, phone, email) if v))
+
+
+def reindex_students(connection, student_ids) -> None:
+    """Replace the trigram rows of `student_ids` from their current values."""
+    student_ids = list(student_ids)
+    if not student_ids:
+        return
+    connection.execute(delete(StudentTrigram).where(StudentTrigram.student_id.in_(student_ids)))
+    rows = connection.execute(
+        select(Student.user_id, Student.full_name, Student.student_uid, Student.phone, User.email)
+        .join(User, User.id == Student.user_id)
+        .where(Student.user_id.in_(student_ids))
+    )
+    values = [
+        {"trigram": gram, "student_id": student_id}
+        for student_id, *fields in rows
+        for gram in _document_trigrams(*fields)
+    ]
+    if values:
+        connection.execute(insert(StudentTrigram), values)
+
+
+def rebuild_student_trigrams(batch_size: int) -> int:
+    """Reindex every student, one batch per transaction; returns how many."""
+    total = 0
+    last_id = 0
+    while True:
+        ids = db.session.scalars(
+            select(Student.user_id)
+            .where(Student.user_id > last_id)
+            .order_by(Student.user_id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            return total
+        reindex_students(db.session.connection(), ids)
+        db.session.commit()
+        total += len(ids)
+        last_id = ids[-1]
+
+
+def fuzzy_student_query(q: str):
+    """`Student.query` ranked by the share of the query's trigrams each student has.
+
+    Students below STUDENT_FUZZY_MIN_SIMILARITY are left out; ties fall back to
+    newest first, like the plain listing.
+    """
+    grams = trigrams(q)
+    min_hits = max(1, math.ceil(len(grams) * current_app.config["STUDENT_FUZZY_MIN_SIMILARITY"]))
+    hits = (
+        select(StudentTrigram.student_id, func.count().label("hits"))
+        .where(StudentTrigram.trigram.in_(grams))
+        .group_by(StudentTrigram.student_id)
+        .having(func.count() >= min_hits)
+        .subquery()
+    )
+    return (
+        Student.query.join(hits, hits.c.student_id == Student.user_id)
+        .order_by(hits.c.hits.desc(), Student.created_at.desc())
+    )
+
+
+def student_search_query(q: str):
+    """Ordered `Student.query` for the admin/API student search box.
+
+    Queries of MIN_QUERY_LENGTH+ characters are fuzzy-ranked via trigrams.
+    Shorter and all-digit ones (ids, phone numbers) keep the substring match.
+    """
+    if len(q) >= MIN_QUERY_LENGTH and not q.isdigit():
+        return fuzzy_student_query(q)
+
+    query = Student.query.join(User, Student.user_id == User.id)
+    if q:
+        like = f"%{q}%"
+        filters = [
+            Student.full_name.ilike(like),
+            Student.student_uid.ilike(like),
+            Student.phone.ilike(like),
+            User.email.ilike(like),
+        ]
+        if q.isdigit():
+            filters.append(Student.user_id == int(q))
+        query = query.filter(or_(*filters))
+    return query.order_by(Student.created_at.desc())
+
+
+def _changed(obj, fields) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in fields)
+
+
+@event.listens_for(Session, "after_flush")
+def _reindex_changed_students(session, flush_context) -> None:
+    student_ids = set()
+    for obj in session.new:
+        if isinstance(obj, Student):
+            student_ids.add(obj.user_id)
+    for obj in session.dirty:
+        if isinstance(obj, Student) and _changed(obj, _STUDENT_FIELDS):
+            student_ids.add(obj.user_id)
+        elif isinstance(obj, User) and obj.role == "student" and _changed(obj, ("email",)):
+            student_ids.add(obj.id)
+    deleted = {obj.user_id for obj in session.deleted if isinstance(obj, Student)}
+
+    if deleted:
+        session.connection().execute(
+            delete(StudentTrigram).where(StudentTrigram.student_id.in_(deleted))
+        )
+    if student_ids - deleted:
+        reindex_students(session.connection(), student_ids - deleted)